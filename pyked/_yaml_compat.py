@@ -0,0 +1,9 @@
+"""
+YAML loader and dumper using libyaml when PyYAML was built with it
+"""
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader, SafeDumper
+
+__all__ = ['SafeLoader', 'SafeDumper']
@@ -2,19 +2,29 @@
 Main ChemKED module
 """
 # Standard libraries
+import os
 from os.path import exists
-from collections import namedtuple
-from warnings import warn
-from copy import deepcopy
+import json
+import hashlib
+from collections import namedtuple, OrderedDict
+from warnings import warn, warn_explicit, catch_warnings, simplefilter
 import xml.etree.ElementTree as etree
 import xml.dom.minidom as minidom
-from itertools import chain
+from operator import attrgetter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import re
+import sys
 
 import numpy as np
 
 # Local imports
 from .validation import schema, OurValidator, yaml, Q_
+from .validation import units as unit_registry
+from .validation import _get_cache_dir
 from .converters import datagroup_properties, ReSpecTh_to_ChemKED
+from ._version import __version__
+from ._yaml_compat import SafeLoader
 
 VolumeHistory = namedtuple('VolumeHistory', ['time', 'volume'])
 VolumeHistory.__doc__ = 'Time history of the volume in an RCM experiment. Deprecated, to be removed after PyKED 0.4'  # noqa: E501
@@ -92,6 +102,14 @@ class ChemKED(object):
         skip_validation (`bool`, optional): Whether validation of the ChemKED should be done. Must
             be supplied as a keyword-argument.
 
+    Note:
+        Set the environment variable ``PYKED_VALIDATION_CACHE=1`` to record YAML files that pass
+        validation without warnings by a hash of their contents, under
+        ``$XDG_CACHE_HOME/pyked/validated`` (``~/.cache`` by default). Recorded files are not
+        validated again by the same version of PyKED and of the schema unless their contents
+        change. Files whose DOI or ORCID checks were skipped, for instance because the network was
+        not available, are not recorded.
+
     Attributes:
         datapoints (`list`): List of `DataPoint` objects storing each datapoint in the database.
         reference (`~collections.namedtuple`): Attributes include ``volume``, ``journal``, ``doi``,
@@ -109,35 +127,23 @@ class ChemKED(object):
     """
     def __init__(self, yaml_file=None, dict_input=None, *, skip_validation=False):
         if yaml_file is not None:
-            with open(yaml_file, 'r') as f:
-                self._properties = yaml.safe_load(f)
+            self._properties = _read_and_validate_yaml(yaml_file, skip_validation)
         elif dict_input is not None:
             self._properties = dict_input
+            if not skip_validation:
+                self.validate_yaml(self._properties)
         else:
             raise NameError("ChemKED needs either a YAML filename or dictionary as input.")
 
-        if not skip_validation:
-            self.validate_yaml(self._properties)
-
         self.datapoints = []
         for point in self._properties['datapoints']:
             self.datapoints.append(DataPoint(point))
 
-        self.reference = Reference(
-            volume=self._properties['reference'].get('volume'),
-            journal=self._properties['reference'].get('journal'),
-            doi=self._properties['reference'].get('doi'),
-            authors=self._properties['reference'].get('authors'),
-            detail=self._properties['reference'].get('detail'),
-            year=self._properties['reference'].get('year'),
-            pages=self._properties['reference'].get('pages'),
-        )
+        reference = self._properties['reference']
+        self.reference = Reference(**{f: reference.get(f) for f in Reference._fields})
 
-        self.apparatus = Apparatus(
-            kind=self._properties['apparatus'].get('kind'),
-            institution=self._properties['apparatus'].get('institution'),
-            facility=self._properties['apparatus'].get('facility'),
-        )
+        apparatus = self._properties['apparatus']
+        self.apparatus = Apparatus(**{f: apparatus.get(f) for f in Apparatus._fields})
 
         for prop in ['chemked-version', 'experiment-type', 'file-authors', 'file-version']:
             setattr(self, prop.replace('-', '_'), self._properties[prop])
@@ -166,7 +172,46 @@ class ChemKED(object):
                                          validate=False)
         return cls(dict_input=properties)
 
-    def validate_yaml(self, properties):
+    @classmethod
+    def load_many(cls, yaml_files, *, workers=None, skip_validation=False):
+        """Load several ChemKED YAML files in parallel.
+
+        Reading and validating the files is farmed out to a pool of worker processes, while the
+        `ChemKED` instances themselves are constructed in the calling process. Warnings from
+        validation, such as skipped DOI and ORCID checks, are issued again in the calling process.
+
+        Arguments:
+            yaml_files (`list`): Filenames of the YAML databases in ChemKED format.
+            workers (`int`, optional): Number of worker processes to use. The default is `None`,
+                which uses as many processes as there are CPUs. Must be supplied as a
+                keyword-argument.
+            skip_validation (`bool`, optional): Whether validation of the ChemKED files should be
+                done. Must be supplied as a keyword-argument.
+
+        Returns:
+            `list`: `ChemKED` instances, in the same order as ``yaml_files``.
+
+        Note:
+            Each worker process holds a copy of PyKED and of the files it has parsed, so memory use
+            grows with the number of workers. Use fewer workers for very large files.
+
+        Example:
+            >>> datasets = ChemKED.load_many(['file1.yaml', 'file2.yaml'], workers=2)
+        """
+        yaml_files = list(yaml_files)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_read_and_validate_yaml_in_worker, yaml_files,
+                                        [skip_validation] * len(yaml_files)))
+
+        datasets = []
+        for properties, caught in results:
+            for message, category, filename, lineno in caught:
+                warn_explicit(message, category, filename, lineno)
+            datasets.append(cls(dict_input=properties, skip_validation=True))
+        return datasets
+
+    @staticmethod
+    def validate_yaml(properties):
         """Validate the parsed YAML file for adherance to the ChemKED format.
 
         Arguments:
@@ -239,7 +284,7 @@ class ChemKED(object):
             `~pandas.DataFrame`: Contains the information regarding each point in the ``datapoints``
                 attribute
         """
-        import pandas as pd
+        pd = _get_pandas()
 
         valid_labels = [a.replace('_', ' ') for a in self.__dict__
                         if not (a.startswith('__') or a.startswith('_'))
@@ -252,7 +297,8 @@ class ChemKED(object):
         valid_labels[ref_index:ref_index + 1] = ['reference:' + a for a in Reference._fields]
         app_index = valid_labels.index('apparatus')
         valid_labels[app_index:app_index + 1] = ['apparatus:' + a for a in Apparatus._fields]
-        species_list = list(set(chain(*[list(d.composition.keys()) for d in self.datapoints])))
+        # Keep the species in the order they are first encountered so the columns are reproducible
+        species_list = list(OrderedDict.fromkeys(s for d in self.datapoints for s in d.composition))
 
         if output_columns is None or len(output_columns) == 0:
             col_labels = valid_labels
@@ -277,31 +323,36 @@ class ChemKED(object):
                 app_index = col_labels.index('apparatus')
                 col_labels[app_index:app_index + 1] = ['apparatus:' + a for a in Apparatus._fields]
 
-        data = []
-        for d in self.datapoints:
-            row = []
-            d_species = list(d.composition.keys())
-            for col in col_labels:
-                if col in species_list:
-                    if col in d_species:
-                        row.append(d.composition[col].amount)
+        # Build the output one column at a time so that pandas only has to infer
+        # the type of each column once
+        num_points = len(self.datapoints)
+        species_set = set(species_list)
+        data = {}
+        for col in col_labels:
+            if col in species_set:
+                values = [None] * num_points
+                for i, d in enumerate(self.datapoints):
+                    species = d.composition.get(col)
+                    if species is not None:
+                        values[i] = species.amount
                     else:
-                        row.append(Q_(0.0, 'dimensionless'))
-                elif 'reference' in col or 'apparatus' in col:
-                    split_col = col.split(':')
-                    if split_col[1] == 'authors':
-                        row.append(getattr(getattr(self, split_col[0]), split_col[1])[0]['name'])
-                    else:
-                        row.append(getattr(getattr(self, split_col[0]), split_col[1]))
-                elif col in ['temperature', 'pressure', 'ignition delay', 'equivalence ratio']:
-                    row.append(getattr(d, col.replace(' ', '_')))
-                elif col == 'file authors':
-                    row.append(getattr(self, col.replace(' ', '_'))[0]['name'])
-                elif col == 'Composition:Kind':
-                    row.append(d.composition_type)
+                        values[i] = Q_(0.0, 'dimensionless')
+            elif 'reference' in col or 'apparatus' in col:
+                split_col = col.split(':')
+                if split_col[1] == 'authors':
+                    value = getattr(getattr(self, split_col[0]), split_col[1])[0]['name']
                 else:
-                    row.append(getattr(self, col.replace(' ', '_')))
-            data.append(row)
+                    value = getattr(getattr(self, split_col[0]), split_col[1])
+                values = [value] * num_points
+            elif col in ['temperature', 'pressure', 'ignition delay', 'equivalence ratio']:
+                values = list(map(attrgetter(col.replace(' ', '_')), self.datapoints))
+            elif col == 'file authors':
+                values = [getattr(self, col.replace(' ', '_'))[0]['name']] * num_points
+            elif col == 'Composition:Kind':
+                values = list(map(attrgetter('composition_type'), self.datapoints))
+            else:
+                values = [getattr(self, col.replace(' ', '_'))] * num_points
+            data[col.title()] = values
 
         col_labels = [a.title() for a in col_labels]
         columns = pd.Index(col_labels)
@@ -585,6 +636,129 @@ class ChemKED(object):
         print('Converted to ' + filename)
 
 
+# Matches the common "<number> <unit name>" form of ChemKED values, e.g. "220 kilopascal"
+_simple_quantity = re.compile(
+    r'^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s+([A-Za-z_]\w*)\s*$'
+)
+
+
+@lru_cache(maxsize=None)
+def _get_unit(unit_name):
+    """Look up a unit by name in the unit registry, caching the result.
+    """
+    return unit_registry.Unit(unit_name)
+
+
+def _to_quantity(value):
+    """Convert a value from a ChemKED file to a `~pint.Quantity`.
+
+    Values of the form ``<number> <unit>`` share the parsed unit with every other value in the
+    same unit, so only the number needs to be converted. Anything else is handed to the pint
+    expression parser.
+    """
+    if isinstance(value, str):
+        match = _simple_quantity.match(value)
+        if match is not None:
+            magnitude, unit_name = match.groups()
+            try:
+                magnitude = int(magnitude)
+            except ValueError:
+                magnitude = float(magnitude)
+            return Q_(magnitude, _get_unit(unit_name))
+
+    return Q_(value)
+
+
+def _get_validation_cache_dir():
+    """Get the directory of the cache of validated files, or `None` if the cache is not enabled.
+
+    Validated files are recorded separately for each version of PyKED and of the schema, since
+    either may change which files are valid.
+    """
+    if os.environ.get('PYKED_VALIDATION_CACHE') != '1':
+        return None
+    schema_key = json.dumps([__version__, schema], sort_keys=True, default=str)
+    return os.path.join(_get_cache_dir(), 'validated',
+                        hashlib.sha256(schema_key.encode('utf-8')).hexdigest())
+
+
+def _add_to_validation_cache(cache_dir, file_hash):
+    """Record the hash of a validated file. Failing to write the cache is not an error.
+
+    Each file is recorded by an empty file named by its hash, so that concurrent loads never
+    overwrite each other's records.
+    """
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        open(os.path.join(cache_dir, file_hash), 'w').close()
+    except OSError:
+        pass
+
+
+def _validate_without_warnings(properties):
+    """Validate the properties of a ChemKED file and report whether no warnings were issued.
+
+    Warnings mean that some checks were skipped, such as DOI and ORCID lookups when the network is
+    not available, so the file must be validated again next time. The warnings are passed on to
+    the caller.
+    """
+    caught = []
+    try:
+        with catch_warnings(record=True) as caught:
+            simplefilter('always')
+            ChemKED.validate_yaml(properties)
+    finally:
+        # Issue the warnings again outside the context, so the caller's filters apply to them
+        for w in caught:
+            warn_explicit(w.message, w.category, w.filename, w.lineno)
+    return not caught
+
+
+_pandas = None
+
+
+def _get_pandas():
+    """Import pandas the first time it is needed, since it is slow to import and optional.
+    """
+    global _pandas
+    if _pandas is None:
+        import pandas
+        _pandas = pandas
+    return _pandas
+
+
+def _read_and_validate_yaml(yaml_file, skip_validation=False):
+    """Read and optionally validate a ChemKED YAML file.
+    """
+    with open(yaml_file, 'rb') as f:
+        contents = f.read()
+    properties = yaml.load(contents, Loader=SafeLoader)
+
+    if not skip_validation:
+        cache_dir = _get_validation_cache_dir()
+        if cache_dir is None:
+            ChemKED.validate_yaml(properties)
+        else:
+            file_hash = hashlib.sha256(contents).hexdigest()
+            if not os.path.exists(os.path.join(cache_dir, file_hash)):
+                if _validate_without_warnings(properties):
+                    _add_to_validation_cache(cache_dir, file_hash)
+
+    return properties
+
+
+def _read_and_validate_yaml_in_worker(yaml_file, skip_validation=False):
+    """Read and optionally validate a ChemKED YAML file in a worker process of `ChemKED.load_many`.
+
+    Warnings issued in a worker process never reach the filters of the calling process, so they
+    are recorded and returned with the properties, to be issued again by the caller.
+    """
+    with catch_warnings(record=True) as caught:
+        simplefilter('always')
+        properties = _read_and_validate_yaml(yaml_file, skip_validation)
+    return properties, [(w.message, w.category, w.filename, w.lineno) for w in caught]
+
+
 class DataPoint(object):
     """Class for a single datapoint.
 
@@ -625,6 +799,15 @@ class DataPoint(object):
         absorption_history (`~collections.namedtuple`, optional): The absorption history of the
             reactor during an experiment.
     """
+    # Databases can hold many datapoints, so avoid a per-instance __dict__
+    __slots__ = (
+        'ignition_delay', 'first_stage_ignition_delay', 'temperature', 'pressure',
+        'pressure_rise', 'rcm_data', 'composition_type', 'composition', 'equivalence_ratio',
+        'ignition_type', 'volume_history', 'temperature_history', 'pressure_history',
+        'piston_position_history', 'light_emission_history', 'OH_emission_history',
+        'absorption_history',
+    )
+
     value_unit_props = [
         'ignition-delay', 'first-stage-ignition-delay', 'temperature', 'pressure',
         'pressure-rise',
@@ -656,10 +839,12 @@ class DataPoint(object):
         else:
             self.rcm_data = None
 
-        self.composition_type = properties['composition']['kind']
+        # The same species names and composition kinds are repeated in every datapoint, so
+        # intern them to share a single string object between datapoints
+        self.composition_type = sys.intern(properties['composition']['kind'])
         composition = {}
         for species in properties['composition']['species']:
-            species_name = species['species-name']
+            species_name = sys.intern(species['species-name'])
             amount = self.process_quantity(species['amount'])
             InChI = species.get('InChI')
             SMILES = species.get('SMILES')
@@ -671,7 +856,10 @@ class DataPoint(object):
         setattr(self, 'composition', composition)
 
         self.equivalence_ratio = properties.get('equivalence-ratio')
-        self.ignition_type = deepcopy(properties.get('ignition-type'))
+        # The ignition type dictionary is often shared among all datapoints via the
+        # common-properties, but it only holds strings so a shallow copy is enough
+        ignition_type = properties.get('ignition-type')
+        self.ignition_type = dict(ignition_type) if ignition_type is not None else None
 
         if 'time-histories' in properties and 'volume-history' in properties:
             raise TypeError('time-histories and volume-history are mutually exclusive')
@@ -722,7 +910,7 @@ class DataPoint(object):
     def process_quantity(self, properties):
         """Process the uncertainty information from a given quantity and return it
         """
-        quant = Q_(properties[0])
+        quant = _to_quantity(properties[0])
         if len(properties) > 1:
             unc = properties[1]
             uncertainty = unc.get('uncertainty', False)
@@ -730,33 +918,34 @@ class DataPoint(object):
             lower_uncertainty = unc.get('lower-uncertainty', False)
             uncertainty_type = unc.get('uncertainty-type')
             if uncertainty_type == 'relative':
-                if uncertainty:
-                    quant = quant.plus_minus(float(uncertainty), relative=True)
-                elif upper_uncertainty and lower_uncertainty:
-                    warn('Asymmetric uncertainties are not supported. The '
-                         'maximum of lower-uncertainty and upper-uncertainty '
-                         'has been used as the symmetric uncertainty.')
-                    uncertainty = max(float(upper_uncertainty), float(lower_uncertainty))
-                    quant = quant.plus_minus(uncertainty, relative=True)
-                else:
-                    raise ValueError('Either "uncertainty" or "upper-uncertainty" and '
-                                     '"lower-uncertainty" need to be specified.')
+                def get_magnitude(value):
+                    return float(value)
             elif uncertainty_type == 'absolute':
-                if uncertainty:
-                    uncertainty = Q_(uncertainty)
-                    quant = quant.plus_minus(uncertainty.to(quant.units).magnitude)
-                elif upper_uncertainty and lower_uncertainty:
-                    warn('Asymmetric uncertainties are not supported. The '
-                         'maximum of lower-uncertainty and upper-uncertainty '
-                         'has been used as the symmetric uncertainty.')
-                    uncertainty = max(Q_(upper_uncertainty), Q_(lower_uncertainty))
-                    quant = quant.plus_minus(uncertainty.to(quant.units).magnitude)
-                else:
-                    raise ValueError('Either "uncertainty" or "upper-uncertainty" and '
-                                     '"lower-uncertainty" need to be specified.')
+                def get_magnitude(value):
+                    # Uncertainties are nearly always given in the units of the value, in which
+                    # case no unit conversion is needed
+                    if isinstance(value, str):
+                        match = _simple_quantity.match(value)
+                        if match is not None and _get_unit(match.group(2)) == quant.units:
+                            return float(match.group(1))
+                    return Q_(value).to(quant.units).magnitude
             else:
                 raise ValueError('uncertainty-type must be one of "absolute" or "relative"')
 
+            if uncertainty:
+                uncertainty = get_magnitude(uncertainty)
+            elif upper_uncertainty and lower_uncertainty:
+                warn('Asymmetric uncertainties are not supported. The '
+                     'maximum of lower-uncertainty and upper-uncertainty '
+                     'has been used as the symmetric uncertainty.')
+                uncertainty = max(get_magnitude(upper_uncertainty),
+                                  get_magnitude(lower_uncertainty))
+            else:
+                raise ValueError('Either "uncertainty" or "upper-uncertainty" and '
+                                 '"lower-uncertainty" need to be specified.')
+
+            quant = quant.plus_minus(uncertainty, relative=(uncertainty_type == 'relative'))
+
         return quant
 
     def get_cantera_composition_string(self, species_conversion=None):
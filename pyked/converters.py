@@ -3,18 +3,36 @@
 
 # Standard libraries
 import os
+from glob import glob
 from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
 from warnings import warn
-import xml.etree.ElementTree as etree
 
-from requests.exceptions import HTTPError, ConnectionError
+try:
+    from lxml import etree
+    # Only lxml 5 and newer can expand the entities declared in the file while refusing external
+    # ones, which could pull the contents of local files into the converted output. Older versions
+    # can only expand all entities or none, so the standard library parser is used with them.
+    if etree.LXML_VERSION < (5, 0):
+        raise ImportError('lxml 5.0 or newer is needed to parse ReSpecTh files safely')
+    # Match the standard library parser, which drops comments and processing instructions,
+    # expands internal entities and never loads external ones
+    _xml_parser = etree.XMLParser(remove_comments=True, remove_pis=True,
+                                  resolve_entities='internal', no_network=True)
+except ImportError:
+    # On Python 3 this loads the C accelerated implementation when it is available, so the
+    # deprecated cElementTree module is not needed
+    import xml.etree.ElementTree as etree
+    _xml_parser = None
+
+from requests.exceptions import HTTPError, ConnectionError, Timeout
 import habanero
-import pint
 
 # Local imports
-from .validation import yaml, property_units, crossref_api
-from .validation import units as unit_registry
+from .validation import yaml, property_units, lookup_doi
+from .validation import _get_dimensionality
 from ._version import __version__
+from ._yaml_compat import SafeDumper
 from . import chemked
 
 # Valid properties for ReSpecTh dataGroup
@@ -23,6 +41,25 @@ datagroup_properties = ['temperature', 'pressure', 'ignition delay',
                         ]
 """`list`: Valid properties for a ReSpecTh dataGroup"""
 
+# Properties allowed in the dataGroup of ignition delay datapoints
+_valid_datapoint_properties = frozenset(datagroup_properties + ['composition'])
+
+# ReSpecTh units whose spelling differs in pint
+_unit_aliases = {'Torr': 'torr'}
+
+# ReSpecTh composition units, mapped to the ChemKED composition kind, the factor that converts
+# the amount to that kind, and the warning given when the meaning of the units is assumed
+_composition_units = {
+    'mole fraction': ('mole fraction', 1.0, None),
+    'mass fraction': ('mass fraction', 1.0, None),
+    'mole percent': ('mole percent', 1.0, None),
+    'percent': ('mole percent', 1.0, 'Assuming percent in composition means mole percent'),
+    'ppm': ('mole fraction', 1.e-6,
+            'Assuming molar ppm in composition and converting to mole fraction'),
+    'ppb': ('mole fraction', 1.e-9,
+            'Assuming molar ppb in composition and converting to mole fraction'),
+}
+
 
 class ParseError(Exception):
     """Base class for errors."""
@@ -67,7 +104,7 @@ def get_file_metadata(root):
     """
     properties = {}
 
-    file_author = getattr(root.find('fileAuthor'), 'text', False)
+    file_author = root.findtext('fileAuthor')
     # Test for missing attribute or empty string in the same statement
     if not file_author:
         raise MissingElementError('fileAuthor')
@@ -83,11 +120,27 @@ def get_file_metadata(root):
     return properties
 
 
-def get_reference(root):
+def _set_reference_detail(reference, ref_key, reason):
+    """Use the preferredKey of a ReSpecTh file as the "detail" of a reference, with a warning.
+
+    Args:
+        reference (`dict`): Reference information to update
+        ref_key (`str`): preferredKey attribute of the bibliographyLink element
+        reason (`str`): Why the fallback is needed, at the start of the warning
+    """
+    warn(reason + ' Setting "detail" key as a fallback; please update to the appropriate fields.')
+    reference['detail'] = ref_key
+    if reference['detail'][-1] != '.':
+        reference['detail'] += '.'
+
+
+def get_reference(root, use_crossref=True):
     """Read reference info from root of ReSpecTh XML file.
 
     Args:
         root (`~xml.etree.ElementTree.Element`): Root of ReSpecTh XML file
+        use_crossref (`bool`, optional): Set to `False` to skip looking up the DOI with Crossref.
+            The DOI is kept and the preferredKey is used for the rest of the reference.
 
     Returns:
         properties (`dict`): Dictionary with reference information
@@ -101,19 +154,20 @@ def get_reference(root):
     ref_doi = elem.get('doi', None)
     ref_key = elem.get('preferredKey', None)
 
-    if ref_doi is not None:
+    if ref_doi is not None and not use_crossref:
+        if ref_key is None:
+            raise KeywordError('Crossref lookup disabled and preferredKey attribute not set')
+        reference['doi'] = ref_doi
+        _set_reference_detail(reference, ref_key, 'Crossref lookup disabled.')
+    elif ref_doi is not None:
         try:
-            ref = crossref_api.works(ids=ref_doi)['message']
-        except (HTTPError, habanero.RequestError, ConnectionError):
+            ref = lookup_doi(ref_doi)
+        except (HTTPError, habanero.RequestError, ConnectionError, Timeout):
             if ref_key is None:
                 raise KeywordError('DOI not found and preferredKey attribute not set')
             else:
-                warn('Missing doi attribute in bibliographyLink or lookup failed. '
-                     'Setting "detail" key as a fallback; please update to the appropriate fields.'
-                     )
-                reference['detail'] = ref_key
-                if reference['detail'][-1] != '.':
-                    reference['detail'] += '.'
+                _set_reference_detail(reference, ref_key, 'Missing doi attribute in '
+                                      'bibliographyLink or lookup failed.')
         else:
             if ref_key is not None:
                 warn('Using DOI to obtain reference information, rather than preferredKey.')
@@ -132,16 +186,15 @@ def get_reference(root):
                 # Add ORCID if available
                 orcid = author.get('ORCID')
                 if orcid:
-                    auth['ORCID'] = orcid.lstrip('http://orcid.org/')
+                    # Crossref gives ORCIDs as URLs, but ChemKED files store the bare ORCID
+                    for prefix in ('http://orcid.org/', 'https://orcid.org/'):
+                        if orcid.startswith(prefix):
+                            orcid = orcid[len(prefix):]
+                    auth['ORCID'] = orcid
                 reference['authors'].append(auth)
 
     elif ref_key is not None:
-        warn('Missing doi attribute in bibliographyLink. '
-             'Setting "detail" key as a fallback; please update to the appropriate fields.'
-             )
-        reference['detail'] = ref_key
-        if reference['detail'][-1] != '.':
-            reference['detail'] += '.'
+        _set_reference_detail(reference, ref_key, 'Missing doi attribute in bibliographyLink.')
     else:
         # Need one of DOI or preferredKey
         raise MissingAttributeError('preferredKey', 'bibliographyLink')
@@ -159,13 +212,16 @@ def get_experiment_kind(root):
         properties (`dict`): Dictionary with experiment type and apparatus information.
     """
     properties = {}
-    if root.find('experimentType').text == 'Ignition delay measurement':
+    experiment_type = root.findtext('experimentType')
+    if not experiment_type:
+        raise MissingElementError('experimentType')
+    elif experiment_type == 'Ignition delay measurement':
         properties['experiment-type'] = 'ignition delay'
     else:
-        raise NotImplementedError(root.find('experimentType').text + ' not (yet) supported')
+        raise NotImplementedError(experiment_type + ' not (yet) supported')
 
     properties['apparatus'] = {'kind': '', 'institution': '', 'facility': ''}
-    kind = getattr(root.find('apparatus/kind'), 'text', False)
+    kind = root.findtext('apparatus/kind')
     # Test for missing attribute or empty string
     if not kind:
         raise MissingElementError('apparatus/kind')
@@ -193,42 +249,33 @@ def get_common_properties(root):
 
         if name == 'initial composition':
             properties['composition'] = {'species': [], 'kind': None}
+            warned_units = set()
 
             for child in elem.iter('component'):
+                species_link = child.find('speciesLink')
+                amount = child.find('amount')
                 spec = {}
-                spec['species-name'] = child.find('speciesLink').attrib['preferredKey']
-                units = child.find('amount').attrib['units']
+                spec['species-name'] = species_link.attrib['preferredKey']
+                units = amount.attrib['units']
 
                 # use InChI for unique species identifier (if present)
-                try:
-                    spec['InChI'] = child.find('speciesLink').attrib['InChI']
-                except KeyError:
+                if 'InChI' in species_link.attrib:
+                    spec['InChI'] = species_link.attrib['InChI']
+                else:
                     # TODO: add InChI validator/search
                     warn('Missing InChI for species ' + spec['species-name'])
-                    pass
-
-                # If mole or mass fraction, just set value
-                if units in ['mole fraction', 'mass fraction', 'mole percent']:
-                    spec['amount'] = [float(child.find('amount').text)]
-                elif units == 'percent':
-                    # assume this means mole percent
-                    warn('Assuming percent in composition means mole percent')
-                    spec['amount'] = [float(child.find('amount').text)]
-                    units = 'mole percent'
-                elif units == 'ppm':
-                    # assume molar ppm, convert to mole fraction
-                    warn('Assuming molar ppm in composition and converting to mole fraction')
-                    spec['amount'] = [float(child.find('amount').text) * 1.e-6]
-                    units = 'mole fraction'
-                elif units == 'ppb':
-                    # assume molar ppb, convert to mole fraction
-                    warn('Assuming molar ppb in composition and converting to mole fraction')
-                    spec['amount'] = [float(child.find('amount').text) * 1.e-9]
-                    units = 'mole fraction'
-                else:
+
+                if units not in _composition_units:
                     raise KeywordError('Composition units need to be one of: mole fraction, '
                                        'mass fraction, mole percent, percent, ppm, or ppb.'
                                        )
+                kind, factor, message = _composition_units[units]
+                # Only warn about the assumed meaning of the units once, not for every species
+                if message is not None and units not in warned_units:
+                    warned_units.add(units)
+                    warn(message)
+                spec['amount'] = [float(amount.text) * factor]
+                units = kind
 
                 properties['composition']['species'].append(spec)
 
@@ -244,12 +291,8 @@ def get_common_properties(root):
         elif name in datagroup_properties:
             field = name.replace(' ', '-')
             units = elem.attrib['units']
-            if units == 'Torr':
-                units = 'torr'
-            quantity = 1.0 * unit_registry(units)
-            try:
-                quantity.to(property_units[field])
-            except pint.DimensionalityError:
+            units = _unit_aliases.get(units, units)
+            if _get_dimensionality(units) != _get_dimensionality(property_units[field]):
                 raise KeywordError('units incompatible for property ' + name)
 
             properties[field] = [' '.join([elem.find('value').text, units])]
@@ -289,7 +332,7 @@ def get_ignition_type(root):
         raise MissingAttributeError('type', 'ignitionType')
 
     # ReSpecTh allows multiple ignition targets
-    if len(ign_target.split(';')) > 1:
+    if ';' in ign_target:
         raise NotImplementedError('Multiple ignition targets not supported.')
 
     # Acceptable ignition targets include pressure, temperature, and species
@@ -339,66 +382,64 @@ def get_datapoints(root):
     for prop in dataGroup.findall('property'):
         unit_id[prop.attrib['id']] = prop.attrib['units']
         temp_prop = prop.attrib['name']
-        if temp_prop not in datagroup_properties + ['composition']:
+        if temp_prop not in _valid_datapoint_properties:
             raise KeyError(temp_prop + ' not valid dataPoint property')
         property_id[prop.attrib['id']] = temp_prop
 
         if temp_prop == 'composition':
-            spec = {'species-name': prop.find('speciesLink').attrib['preferredKey']}
+            species_link = prop.find('speciesLink')
+            spec = {'species-name': species_link.attrib['preferredKey']}
             # use InChI for unique species identifier (if present)
-            try:
-                spec['InChI'] = prop.find('speciesLink').attrib['InChI']
-            except KeyError:
+            if 'InChI' in species_link.attrib:
+                spec['InChI'] = species_link.attrib['InChI']
+            else:
                 # TODO: add InChI validator/search
                 warn('Missing InChI for species ' + spec['species-name'])
-                pass
             species_id[prop.attrib['id']] = spec
 
     if not property_id:
         raise MissingElementError('property')
 
+    # Work out how to read the value of each property once, rather than for every datapoint
+    value_fields = {}
+    composition_units = {}
+    for tag, name in property_id.items():
+        if name == 'composition':
+            composition_units[tag] = _composition_units.get(unit_id[tag])
+        else:
+            units = _unit_aliases.get(unit_id[tag], unit_id[tag])
+            value_fields[tag] = (name.replace(' ', '-'), ' ' + units)
+
     # now get data points
     datapoints = []
-    for dp in dataGroup.findall('dataPoint'):
+    warned_units = set()
+    for dp in dataGroup.iterfind('dataPoint'):
         datapoint = {}
-        if 'composition' in property_id.values():
+        if composition_units:
             datapoint['composition'] = {'species': [], 'kind': None}
 
         for val in dp:
             # handle "regular" properties differently than composition
-            if property_id.get(val.tag) in datagroup_properties:
-                units = unit_id[val.tag]
-                if units == 'Torr':
-                    units = 'torr'
-                datapoint[property_id[val.tag].replace(' ', '-')] = [val.text + ' ' + units]
-            elif property_id.get(val.tag) == 'composition':
+            if val.tag in value_fields:
+                field, units = value_fields[val.tag]
+                datapoint[field] = [val.text + units]
+            elif val.tag in composition_units:
                 spec = {}
                 spec['species-name'] = species_id[val.tag]['species-name']
                 spec['InChI'] = species_id[val.tag].get('InChI')
 
                 units = unit_id[val.tag]
-                # If mole or mass fraction, just set value
-                if units in ['mole fraction', 'mass fraction', 'mole percent']:
-                    spec['amount'] = [float(val.text)]
-                elif units == 'percent':
-                    # assume this means mole percent
-                    warn('Assuming percent in composition means mole percent')
-                    spec['amount'] = [float(val.text)]
-                    units = 'mole percent'
-                elif units == 'ppm':
-                    # assume molar ppm, convert to mole fraction
-                    warn('Assuming molar ppm in composition and converting to mole fraction')
-                    spec['amount'] = [float(val.text) * 1.e-6]
-                    units = 'mole fraction'
-                elif units == 'ppb':
-                    # assume molar ppb, convert to mole fraction
-                    warn('Assuming molar ppb in composition and converting to mole fraction')
-                    spec['amount'] = [float(val.text) * 1.e-9]
-                    units = 'mole fraction'
-                else:
+                if composition_units[val.tag] is None:
                     raise KeywordError('composition units need to be one of: mole fraction, '
                                        'mass fraction, mole percent, percent, ppm, or ppb.'
                                        )
+                kind, factor, message = composition_units[val.tag]
+                # Only warn about the assumed meaning of the units once, not for every datapoint
+                if message is not None and units not in warned_units:
+                    warned_units.add(units)
+                    warn(message)
+                spec['amount'] = [float(val.text) * factor]
+                units = kind
 
                 # check consistency of composition type
                 if datapoint['composition']['kind'] is None:
@@ -445,18 +486,16 @@ def get_datapoints(root):
                 {'time': time_dict, 'quantity': q, 'type': t, 'values': []}
                 for (q, t) in zip(quant_dicts, quant_types)
             ]
+            quant_types_by_tag = dict(zip(quant_tags, quant_types))
             # collect volume-time history
-            for dp in dataGroup.findall('dataPoint'):
+            for dp in dataGroup.iterfind('dataPoint'):
                 time = None
                 quants = {}
                 for val in dp:
                     if val.tag == time_tag:
                         time = float(val.text)
-                    elif val.tag in quant_tags:
-                        quant = float(val.text)
-                        tag_idx = quant_tags.index(val.tag)
-                        quant_type = quant_types[tag_idx]
-                        quants[quant_type] = quant
+                    elif val.tag in quant_types_by_tag:
+                        quants[quant_types_by_tag[val.tag]] = float(val.text)
                     else:
                         raise KeywordError('Value tag {} not found in dataGroup tags: '
                                            '{}'.format(val.tag, quant_tags))
@@ -471,7 +510,8 @@ def get_datapoints(root):
     return datapoints
 
 
-def ReSpecTh_to_ChemKED(filename_xml, file_author='', file_author_orcid='', *, validate=False):
+def ReSpecTh_to_ChemKED(filename_xml, file_author='', file_author_orcid='', *, validate=False,
+                        use_crossref=True):
     """Convert ReSpecTh XML file to ChemKED-compliant dictionary.
 
     Args:
@@ -481,16 +521,20 @@ def ReSpecTh_to_ChemKED(filename_xml, file_author='', file_author_orcid='', *, v
         validate (`bool`, optional, keyword-only): Set to `True` to validate the resulting
             property dictionary with `ChemKED`. Set to `False` if the file is being loaded and will
             be validated at some other point before use.
+        use_crossref (`bool`, optional, keyword-only): Set to `False` to skip looking up the
+            reference DOI with Crossref. The DOI is kept and the preferredKey fills in the rest of
+            the reference. The reference then has no authors or year, so the result does not
+            pass validation and ``validate`` should be `False`.
     """
     # get all information from XML file
-    tree = etree.parse(filename_xml)
+    tree = etree.parse(filename_xml, parser=_xml_parser)
     root = tree.getroot()
 
     # get file metadata
     properties = get_file_metadata(root)
 
     # get reference info
-    properties['reference'] = get_reference(root)
+    properties['reference'] = get_reference(root, use_crossref)
     # Save name of original data filename
     properties['reference']['detail'] = (properties['reference'].get('detail', '') +
                                          'Converted from ReSpecTh XML file ' +
@@ -509,18 +553,17 @@ def ReSpecTh_to_ChemKED(filename_xml, file_author='', file_author_orcid='', *, v
     # Now parse ignition delay datapoints
     properties['datapoints'] = get_datapoints(root)
 
-    # Ensure inclusion of pressure rise or volume history matches apparatus.
-    has_pres_rise = ('pressure-rise' in properties['common-properties'] or
-                     any([True for dp in properties['datapoints'] if 'pressure-rise' in dp])
-                     )
-    if has_pres_rise and properties['apparatus']['kind'] == 'rapid compression machine':
+    # Ensure inclusion of pressure rise or volume history matches apparatus. Check the apparatus
+    # first, so the datapoints are only searched when it matters.
+    kind = properties['apparatus']['kind']
+    if kind == 'rapid compression machine' and (
+            'pressure-rise' in properties['common-properties'] or
+            any('pressure-rise' in dp for dp in properties['datapoints'])):
         raise KeywordError('Pressure rise cannot be defined for RCM.')
 
-    has_vol_hist = any(
-        [t.get('type') == 'volume' for dp in properties['datapoints']
-         for t in dp.get('time-histories', [{}])]
-    )
-    if has_vol_hist and properties['apparatus']['kind'] == 'shock tube':
+    if kind == 'shock tube' and any(
+            t.get('type') == 'volume' for dp in properties['datapoints']
+            for t in dp.get('time-histories', ())):
         raise KeywordError('Volume history cannot be defined for shock tube.')
 
     # add any additional file authors
@@ -534,9 +577,8 @@ def ReSpecTh_to_ChemKED(filename_xml, file_author='', file_author_orcid='', *, v
         properties['file-authors'].append(temp_author)
 
     # Now go through datapoints and apply common properties
-    for idx in range(len(properties['datapoints'])):
-        for prop in properties['common-properties']:
-            properties['datapoints'][idx][prop] = properties['common-properties'][prop]
+    for datapoint in properties['datapoints']:
+        datapoint.update(properties['common-properties'])
 
     if validate:
         chemked.ChemKED(dict_input=properties)
@@ -575,14 +617,22 @@ def respth2ck(argv=None):
                         default='',
                         help='File author ORCID'
                         )
+    parser.add_argument('--no-crossref',
+                        dest='use_crossref',
+                        action='store_false',
+                        help='Use the preferredKey of the reference instead of looking up its '
+                             'DOI. The converted file is not validated.'
+                        )
 
     args = parser.parse_args(argv)
 
     filename_ck = args.output
     filename_xml = args.input
 
+    # Without Crossref the reference has no authors or year, which the schema requires, so the
+    # converted file cannot be validated until they are filled in
     properties = ReSpecTh_to_ChemKED(filename_xml, args.file_author, args.file_author_orcid,
-                                     validate=True)
+                                     validate=args.use_crossref, use_crossref=args.use_crossref)
 
     # set output filename and path
     if not filename_ck:
@@ -591,10 +641,105 @@ def respth2ck(argv=None):
                                    )
 
     with open(filename_ck, 'w') as outfile:
-        yaml.dump(properties, outfile, default_flow_style=False)
+        yaml.dump(properties, outfile, Dumper=SafeDumper, default_flow_style=False)
     print('Converted to ' + filename_ck)
 
 
+def respth2ck_batch(argv=None):
+    """Command-line entry point for converting several ReSpecTh XML files to ChemKED YAML files.
+
+    The files are converted in parallel worker processes, so that the parsing of one file and the
+    DOI lookup of another overlap.
+    """
+    parser = ArgumentParser(
+        description='Convert ReSpecTh XML files to ChemKED YAML files.'
+        )
+    parser.add_argument('-i', '--input',
+                        type=str,
+                        nargs='+',
+                        required=False,
+                        default=[],
+                        help='Input filenames (e.g., "file1.xml file2.xml")'
+                        )
+    parser.add_argument('-id', '--input-dir',
+                        dest='input_dir',
+                        type=str,
+                        required=False,
+                        default='',
+                        help='Directory whose .xml files are all converted'
+                        )
+    parser.add_argument('-d', '--output-dir',
+                        dest='output_dir',
+                        type=str,
+                        required=False,
+                        default='',
+                        help='Output directory, by default the directory of each input file'
+                        )
+    parser.add_argument('-fa', '--file-author',
+                        dest='file_author',
+                        type=str,
+                        required=False,
+                        default='',
+                        help='File author name to override original'
+                        )
+    parser.add_argument('-fo', '--file-author-orcid',
+                        dest='file_author_orcid',
+                        type=str,
+                        required=False,
+                        default='',
+                        help='File author ORCID'
+                        )
+    parser.add_argument('--no-crossref',
+                        dest='use_crossref',
+                        action='store_false',
+                        help='Use the preferredKey of the reference instead of looking up its '
+                             'DOI. The converted file is not validated.'
+                        )
+    parser.add_argument('-j', '--jobs',
+                        type=int,
+                        required=False,
+                        default=None,
+                        help='Number of worker processes, by default the number of CPUs'
+                        )
+
+    args = parser.parse_args(argv)
+
+    filenames_xml = list(args.input)
+    if args.input_dir:
+        filenames_xml += sorted(glob(os.path.join(args.input_dir, '*.xml')))
+    if not filenames_xml:
+        parser.error('no input files given; use -i and/or -id')
+
+    respth2ck_argvs = []
+    filenames_ck = {}
+    for filename_xml in filenames_xml:
+        filename_ck = os.path.join(args.output_dir or os.path.dirname(filename_xml),
+                                   os.path.splitext(os.path.basename(filename_xml))[0] + '.yaml'
+                                   )
+        # Convert a file given both with -i and through -id only once, and refuse to start if two
+        # different inputs would be written to the same file by different workers
+        key = os.path.normcase(os.path.abspath(filename_ck))
+        if key in filenames_ck:
+            if filenames_ck[key] == os.path.normcase(os.path.abspath(filename_xml)):
+                continue
+            parser.error('{} and {} would both be converted to {}'.format(
+                filenames_ck[key], filename_xml, filename_ck))
+        filenames_ck[key] = os.path.normcase(os.path.abspath(filename_xml))
+
+        respth2ck_argv = ['-i', filename_xml, '-o', filename_ck, '-fa', args.file_author,
+                          '-fo', args.file_author_orcid]
+        if not args.use_crossref:
+            respth2ck_argv.append('--no-crossref')
+        respth2ck_argvs.append(respth2ck_argv)
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        # Consume the results so that errors from the workers are raised here
+        list(executor.map(respth2ck, respth2ck_argvs))
+
+
 def ck2respth(argv=None):
     """Command-line entry point for converting a ChemKED YAML file to a ReSpecTh XML file.
     """
@@ -651,22 +796,31 @@ def main(argv=None):
                         default='',
                         help='File author ORCID'
                         )
+    parser.add_argument('--no-crossref',
+                        dest='use_crossref',
+                        action='store_false',
+                        help='Use the preferredKey of the reference instead of looking up its '
+                             'DOI. The converted file is not validated.'
+                        )
 
     args = parser.parse_args(argv)
 
-    if os.path.splitext(args.input)[1] == '.xml' and os.path.splitext(args.output)[1] == '.yaml':
-        respth2ck(['-i', args.input, '-o', args.output, '-fa', args.file_author,
-                   '-fo', args.file_author_orcid])
+    input_ext = os.path.splitext(args.input)[1]
+    output_ext = os.path.splitext(args.output)[1]
+
+    if input_ext == '.xml' and output_ext == '.yaml':
+        respth2ck_argv = ['-i', args.input, '-o', args.output, '-fa', args.file_author,
+                          '-fo', args.file_author_orcid]
+        if not args.use_crossref:
+            respth2ck_argv.append('--no-crossref')
+        respth2ck(respth2ck_argv)
 
-    elif os.path.splitext(args.input)[1] == '.yaml' and os.path.splitext(args.output)[1] == '.xml':
+    elif input_ext == '.yaml' and output_ext == '.xml':
         c = chemked.ChemKED(yaml_file=args.input)
         c.convert_to_ReSpecTh(args.output)
 
-    elif os.path.splitext(args.input)[1] == '.xml' and os.path.splitext(args.output)[1] == '.xml':
-        raise KeywordError('Cannot convert .xml to .xml')
-
-    elif os.path.splitext(args.input)[1] == '.yaml' and os.path.splitext(args.output)[1] == '.yaml':
-        raise KeywordError('Cannot convert .yaml to .yaml')
+    elif input_ext == output_ext and input_ext in ['.xml', '.yaml']:
+        raise KeywordError('Cannot convert {0} to {0}'.format(input_ext))
 
     else:
         raise KeywordError('Input/output args need to be .xml/.yaml')
@@ -1,16 +1,47 @@
 """
 Module for ORCID interaction
 """
+from functools import lru_cache
+import json
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 headers = {'Accept': 'application/json'}
 
+session = requests.Session()
+"""`~requests.Session` shared by all ORCID lookups, so that connections are reused"""
+
+session.headers.update(headers)
+# Retry a transient server error once, then hand the last response back for raise_for_status.
+# Client errors such as an unknown ORCID are never retried, and neither are connection or read
+# errors, so an unavailable network is still reported straight away.
+session.mount('https://', HTTPAdapter(
+    pool_connections=10, pool_maxsize=10,
+    max_retries=Retry(total=1, connect=0, read=0, backoff_factor=0.3,
+                      status_forcelist=(500, 502, 503, 504), raise_on_status=False),
+    ))
+
+
+@lru_cache(maxsize=1024)
+def _fetch_person(orcid):
+    """Get the JSON text of the personal details of an ORCID, caching successful lookups.
+    """
+    url = 'https://pub.orcid.org/v2.1/{orcid}/person'.format(orcid=orcid)
+    r = session.get(url, timeout=10)
+    if r.status_code != 200:
+        r.raise_for_status()
+    return r.text
+
 
 def search_orcid(orcid):
     """
     Search the ORCID public API
 
     Specfically, return a dictionary with the personal details
-    (name, etc.) of the person associated with the given ORCID
+    (name, etc.) of the person associated with the given ORCID.
+    Successful lookups are cached for the rest of the session.
 
     Args:
         orcid (`str`): The ORCID to be searched
@@ -21,9 +52,7 @@ def search_orcid(orcid):
     Raises:
         `~requests.HTTPError`: If the given ORCID cannot be found, an `~requests.HTTPError`
             is raised with status code 404
+        `~requests.Timeout`: If the ORCID API does not respond within 10 seconds
     """
-    url = 'https://pub.orcid.org/v2.1/{orcid}/person'.format(orcid=orcid)
-    r = requests.get(url, headers=headers)
-    if r.status_code != 200:
-        r.raise_for_status()
-    return r.json()
+    # Decode the cached text on every call, so callers each get a dictionary they can modify
+    return json.loads(_fetch_person(orcid))
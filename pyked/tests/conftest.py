@@ -0,0 +1,20 @@
+"""
+Shared fixtures for the PyKED tests
+"""
+# Standard libraries
+import os
+
+import pytest
+
+
+@pytest.fixture(scope='session', autouse=True)
+def isolated_cache_home(tmpdir_factory):
+    """Keep the on-disk caches written during the tests out of the user's cache directory.
+    """
+    old_cache_home = os.environ.get('XDG_CACHE_HOME')
+    os.environ['XDG_CACHE_HOME'] = str(tmpdir_factory.mktemp('cache'))
+    yield
+    if old_cache_home is None:
+        del os.environ['XDG_CACHE_HOME']
+    else:
+        os.environ['XDG_CACHE_HOME'] = old_cache_home
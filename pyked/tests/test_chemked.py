@@ -3,10 +3,9 @@ Test module for chemked.py
 """
 # Standard libraries
 import os
-import pkg_resources
 import warnings
 from tempfile import TemporaryDirectory
-import xml.etree.ElementTree as etree
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 
 # Third-party libraries
@@ -15,13 +14,111 @@ import pytest
 
 # Local imports
 from ..validation import schema, OurValidator, yaml, Q_
+from .. import chemked
 from ..chemked import ChemKED, DataPoint, Composition
-from ..converters import get_datapoints, get_common_properties
+# Parse XML with the same library and parser settings as the converters (lxml if installed)
+from ..converters import get_datapoints, get_common_properties, etree, _xml_parser
 from .._version import __version__
+from .._yaml_compat import SafeLoader
+
+if __version__ not in schema['chemked-version']['allowed']:
+    schema['chemked-version']['allowed'].append(__version__)
+v = OurValidator(schema)
+
+# Directory holding the test data files
+_test_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Columns of dataframe_st.csv that hold quantities, and the column subsets used by the custom
+# DataFrame tests
+_dataframe_st_converters = {
+    'Ignition Delay': Q_,
+    'Temperature': Q_,
+    'Pressure': Q_,
+    'H2': Q_,
+    'Ar': Q_,
+    'O2': Q_,
+}
+_custom_columns = (
+    'Apparatus:Kind', 'Apparatus:Institution', 'Apparatus:Facility', 'Reference:Volume',
+    'Reference:Journal', 'Reference:Doi', 'Reference:Authors', 'Reference:Detail',
+    'Reference:Year', 'Reference:Pages', 'Temperature', 'Ignition Delay', 'H2', 'Ar', 'O2',
+    'Composition:Kind',
+)
+_custom_columns_2 = ('Temperature', 'Ignition Delay', 'Pressure')
+
+# Time and volume trace of the RCM test files, also stored in rcm_history.csv. The volumes are
+# kept as a literal so that reading the CSV file is checked against independent values.
+_rcm_times = np.arange(0, 9.7e-2, 1.e-3)
+_rcm_volumes = np.array([
+    5.47669375000E+002, 5.46608789894E+002, 5.43427034574E+002,
+    5.38124109043E+002, 5.30700013298E+002, 5.21154747340E+002,
+    5.09488311170E+002, 4.95700704787E+002, 4.79791928191E+002,
+    4.61761981383E+002, 4.41610864362E+002, 4.20399162234E+002,
+    3.99187460106E+002, 3.77975757979E+002, 3.56764055851E+002,
+    3.35552353723E+002, 3.14340651596E+002, 2.93128949468E+002,
+    2.71917247340E+002, 2.50705545213E+002, 2.29493843085E+002,
+    2.08282140957E+002, 1.87070438830E+002, 1.65858736702E+002,
+    1.44647034574E+002, 1.23435332447E+002, 1.02223630319E+002,
+    8.10119281915E+001, 6.33355097518E+001, 5.27296586879E+001,
+    4.91943750000E+001, 4.97137623933E+001, 5.02063762048E+001,
+    5.06454851923E+001, 5.10218564529E+001, 5.13374097598E+001,
+    5.16004693977E+001, 5.18223244382E+001, 5.20148449242E+001,
+    5.21889350372E+001, 5.23536351113E+001, 5.25157124459E+001,
+    5.26796063730E+001, 5.28476160610E+001, 5.30202402028E+001,
+    5.31965961563E+001, 5.33748623839E+001, 5.35527022996E+001,
+    5.37276399831E+001, 5.38973687732E+001, 5.40599826225E+001,
+    5.42141273988E+001, 5.43590751578E+001, 5.44947289126E+001,
+    5.46215686913E+001, 5.47405518236E+001, 5.48529815402E+001,
+    5.49603582190E+001, 5.50642270863E+001, 5.51660349836E+001,
+    5.52670070646E+001, 5.53680520985E+001, 5.54697025392E+001,
+    5.55720927915E+001, 5.56749762728E+001, 5.57777790517E+001,
+    5.58796851466E+001, 5.59797461155E+001, 5.60770054561E+001,
+    5.61706266985E+001, 5.62600130036E+001, 5.63449057053E+001,
+    5.64254496625E+001, 5.65022146282E+001, 5.65761642150E+001,
+    5.66485675508E+001, 5.67208534842E+001, 5.67944133373E+001,
+    5.68703658198E+001, 5.69493069272E+001, 5.70310785669E+001,
+    5.71146023893E+001, 5.71978399741E+001, 5.72779572372E+001,
+    5.73517897984E+001, 5.74167271960E+001, 5.74721573687E+001,
+    5.75216388520E+001, 5.75759967785E+001, 5.76575701358E+001,
+    5.78058719368E+001, 5.80849611077E+001, 5.85928651155E+001,
+    5.94734357453E+001, 6.09310671165E+001, 6.32487551103E+001,
+    6.68100309742E+001
+])
+
+
+@pytest.fixture(autouse=True)
+def always_warn():
+    """Report every warning during a test, even if the same warning was issued before.
+    """
+    with warnings.catch_warnings():
+        # Appended, so filterwarnings marks on individual tests still take precedence
+        warnings.simplefilter('always', append=True)
+        yield
+
+
+@pytest.fixture(scope='session')
+def load_yaml():
+    """Return a function that parses each test file once per session.
+
+    Every call returns a deep copy of the parsed file, so tests may modify it freely.
+    """
+    parsed = {}
+
+    def load(filename):
+        if filename not in parsed:
+            with open(os.path.join(_test_dir, filename), 'r') as f:
+                parsed[filename] = yaml.load(f, Loader=SafeLoader)
+        return deepcopy(parsed[filename])
 
-schema['chemked-version']['allowed'].append(__version__)
+    return load
 
-warnings.simplefilter('always')
+
+def _magnitudes_close(quantity, expected):
+    """Compare the magnitude of a quantity with the expected quantity, in the expected units.
+
+    Converting once and comparing plain floats avoids dispatching np.isclose through pint.
+    """
+    return np.isclose(quantity.to(expected.units).magnitude, expected.magnitude)
 
 
 class TestChemKED(object):
@@ -29,32 +126,118 @@ class TestChemKED(object):
     """
     def test_create_chemked(self):
         file_path = os.path.join('testfile_st.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
         ChemKED(filename)
 
     def test_skip_validation(self):
         file_path = os.path.join('testfile_bad.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
         ChemKED(filename, skip_validation=True)
 
+    def test_load_many(self):
+        # Neither file has a DOI or ORCID, so validating them needs no network
+        filenames = [os.path.join(_test_dir, f)
+                     for f in ['testfile_required.yaml', 'testfile_uncertainty.yaml']]
+        c_required, c_uncertainty = ChemKED.load_many(filenames, workers=2)
+        assert len(c_required.datapoints) == 3
+        assert len(c_uncertainty.datapoints) == 4
+        assert c_required.reference.year == 1600
+
+    def test_load_many_warnings(self, monkeypatch):
+        """Ensure validation warnings from the workers reach the caller.
+        """
+        def validate_yaml(properties):
+            warnings.warn('network not available, DOI not validated.')
+
+        # Run the worker in a thread, so that it sees the replaced validate_yaml
+        monkeypatch.setattr(chemked, 'ProcessPoolExecutor', ThreadPoolExecutor)
+        monkeypatch.setattr(ChemKED, 'validate_yaml', staticmethod(validate_yaml))
+        filenames = [os.path.join(_test_dir, 'testfile_required.yaml')] * 2
+        with pytest.warns(UserWarning) as record:
+            ChemKED.load_many(filenames, workers=1)
+
+        messages = [str(w.message) for w in record]
+        assert messages == ['network not available, DOI not validated.'] * 2
+
+    def test_load_many_invalid(self):
+        filename = os.path.join(_test_dir, 'testfile_bad.yaml')
+        with pytest.raises(ValueError):
+            ChemKED.load_many([filename], workers=1)
+
+    @pytest.fixture
+    def validations(self, tmpdir, monkeypatch):
+        """Record the calls to ChemKED.validate_yaml, keeping the cache in a temporary directory.
+        """
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmpdir))
+        calls = []
+        monkeypatch.setattr(ChemKED, 'validate_yaml', staticmethod(calls.append))
+        return calls
+
+    def test_validation_cache(self, tmpdir, monkeypatch, validations):
+        monkeypatch.setenv('PYKED_VALIDATION_CACHE', '1')
+        filename = os.path.join(_test_dir, 'testfile_st.yaml')
+        c = ChemKED(filename)
+        assert len(validations) == 1
+        assert len(tmpdir.join('pyked', 'validated').listdir()) == 1
+
+        c2 = ChemKED(filename)
+        assert len(validations) == 1
+        assert len(c2.datapoints) == len(c.datapoints)
+
+    def test_validation_cache_schema_change(self, monkeypatch, validations):
+        monkeypatch.setenv('PYKED_VALIDATION_CACHE', '1')
+        filename = os.path.join(_test_dir, 'testfile_st.yaml')
+        ChemKED(filename)
+        monkeypatch.setitem(schema['chemked-version'], 'allowed',
+                            schema['chemked-version']['allowed'] + ['99.0.0'])
+        ChemKED(filename)
+        assert len(validations) == 2
+
+    def test_validation_cache_warnings(self, tmpdir, monkeypatch, validations):
+        """Files whose validation issued warnings, e.g., skipped DOI checks, are not recorded.
+        """
+        def validate_yaml(properties):
+            validations.append(properties)
+            warnings.warn('Crossref API not available, DOI could not be checked')
+
+        monkeypatch.setattr(ChemKED, 'validate_yaml', staticmethod(validate_yaml))
+        monkeypatch.setenv('PYKED_VALIDATION_CACHE', '1')
+        filename = os.path.join(_test_dir, 'testfile_st.yaml')
+        for i in range(2):
+            with pytest.warns(UserWarning, match='DOI could not be checked'):
+                ChemKED(filename)
+        assert len(validations) == 2
+        assert not tmpdir.join('pyked', 'validated').check()
+
+    def test_validation_cache_disabled(self, tmpdir, monkeypatch, validations):
+        monkeypatch.delenv('PYKED_VALIDATION_CACHE', raising=False)
+        filename = os.path.join(_test_dir, 'testfile_st.yaml')
+        ChemKED(filename)
+        ChemKED(filename)
+        assert len(validations) == 2
+        assert not tmpdir.join('pyked', 'validated').check()
+
     def test_datapoints(self):
         file_path = os.path.join('testfile_st.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        c = ChemKED(filename)
+        filename = os.path.join(_test_dir, file_path)
+        c = ChemKED(filename, skip_validation=True)
         assert len(c.datapoints) == 5
 
         temperatures = Q_([1164.48, 1164.97, 1264.2, 1332.57, 1519.18], 'K')
         ignition_delays = Q_([471.54, 448.03, 291.57, 205.93, 88.11], 'us')
 
-        for i, d in enumerate(c.datapoints):
-            assert np.isclose(d.ignition_delay, ignition_delays[i])
-            assert np.isclose(d.pressure, Q_(220., 'kPa'))
-            assert np.isclose(d.temperature, temperatures[i])
-            assert d.pressure_rise is None
-            assert d.volume_history is None
-            assert d.rcm_data is None
-            assert d.ignition_type['type'] == 'd/dt max'
-            assert d.ignition_type['target'] == 'pressure'
+        dp_ignition_delays = [d.ignition_delay.to('us').magnitude for d in c.datapoints]
+        dp_pressures = [d.pressure.to('kPa').magnitude for d in c.datapoints]
+        dp_temperatures = [d.temperature.to('K').magnitude for d in c.datapoints]
+        assert np.allclose(dp_ignition_delays, ignition_delays.magnitude)
+        assert np.allclose(dp_pressures, 220.)
+        assert np.allclose(dp_temperatures, temperatures.magnitude)
+
+        assert all(d.pressure_rise is None for d in c.datapoints)
+        assert all(d.volume_history is None for d in c.datapoints)
+        assert all(d.rcm_data is None for d in c.datapoints)
+        assert all(d.ignition_type['type'] == 'd/dt max' for d in c.datapoints)
+        assert all(d.ignition_type['target'] == 'pressure' for d in c.datapoints)
 
     def test_no_input(self):
         """Test that no input raises an exception
@@ -62,19 +245,13 @@ class TestChemKED(object):
         with pytest.raises(NameError):
             ChemKED()
 
-    def test_dict_input(self):
-        file_path = os.path.join('testfile_required.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        with open(filename, 'r') as f:
-            properties = yaml.safe_load(f)
+    def test_dict_input(self, load_yaml):
+        properties = load_yaml('testfile_required.yaml')
 
         ChemKED(dict_input=properties)
 
-    def test_unallowed_input(self, capfd):
-        file_path = os.path.join('testfile_required.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        with open(filename, 'r') as f:
-            properties = yaml.safe_load(f)
+    def test_unallowed_input(self, capfd, load_yaml):
+        properties = load_yaml('testfile_required.yaml')
 
         properties['experiment-type'] = 'Ignition Delay'  # should be 'ignition delay'
 
@@ -85,11 +262,8 @@ class TestChemKED(object):
         assert out == ("experiment-type has an illegal value. Allowed values are ['ignition "
                        "delay'] and are case sensitive.\n")
 
-    def test_missing_input(self, capfd):
-        file_path = os.path.join('testfile_required.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        with open(filename, 'r') as f:
-            properties = yaml.safe_load(f)
+    def test_missing_input(self, capfd, load_yaml):
+        properties = load_yaml('testfile_required.yaml')
 
         properties.pop('apparatus')
 
@@ -108,75 +282,41 @@ class TestDataFrameOutput(object):
     def pdt(self):
         return pytest.importorskip('pandas.util.testing')
 
-    def test_get_dataframe(self, pd, pdt):
-        yaml_file = os.path.join('testfile_st.yaml')
-        yaml_filename = pkg_resources.resource_filename(__name__, yaml_file)
-        c = ChemKED(yaml_filename).get_dataframe()
-        csv_file = os.path.join('dataframe_st.csv')
-        csv_filename = pkg_resources.resource_filename(__name__, csv_file)
-        converters = {
-            'Ignition Delay': Q_,
-            'Temperature': Q_,
-            'Pressure': Q_,
-            'H2': Q_,
-            'Ar': Q_,
-            'O2': Q_,
-        }
-        df = pd.read_csv(csv_filename, index_col=0, converters=converters)
-        pdt.assert_frame_equal(c.sort_index(axis=1), df.sort_index(axis=1), check_names=True)
-
-    def test_custom_dataframe(self, pd, pdt):
-        yaml_file = os.path.join('testfile_st.yaml')
-        yaml_filename = pkg_resources.resource_filename(__name__, yaml_file)
+    @pytest.fixture(scope='class')
+    def chemked_st(self):
+        yaml_filename = os.path.join(_test_dir, 'testfile_st.yaml')
+        return ChemKED(yaml_filename, skip_validation=True)
+
+    @pytest.fixture(scope='class')
+    def csv_st_df(self, pd):
+        csv_filename = os.path.join(_test_dir, 'dataframe_st.csv')
+        df = pd.read_csv(csv_filename, index_col=0, converters=_dataframe_st_converters)
+        return df.sort_index(axis=1)
+
+    def test_get_dataframe(self, pdt, chemked_st, csv_st_df):
+        c = chemked_st.get_dataframe()
+        pdt.assert_frame_equal(c.sort_index(axis=1), csv_st_df, check_names=True)
+
+    def test_custom_dataframe(self, pdt, chemked_st, csv_st_df):
         cols_to_get = ['composition', 'Reference', 'apparatus', 'temperature', 'ignition delay']
-        c = ChemKED(yaml_filename).get_dataframe(cols_to_get)
-        csv_file = os.path.join('dataframe_st.csv')
-        csv_filename = pkg_resources.resource_filename(__name__, csv_file)
-        converters = {
-            'Ignition Delay': Q_,
-            'Temperature': Q_,
-            'Pressure': Q_,
-            'H2': Q_,
-            'Ar': Q_,
-            'O2': Q_,
-        }
-        use_cols = ['Apparatus:Kind', 'Apparatus:Institution', 'Apparatus:Facility',
-                    'Reference:Volume', 'Reference:Journal', 'Reference:Doi', 'Reference:Authors',
-                    'Reference:Detail', 'Reference:Year', 'Reference:Pages', 'Temperature',
-                    'Ignition Delay', 'H2', 'Ar', 'O2', 'Composition:Kind'
-                    ]
-        df = pd.read_csv(csv_filename, converters=converters, usecols=use_cols)
-        pdt.assert_frame_equal(c.sort_index(axis=1), df.sort_index(axis=1), check_names=True)
-
-    def test_custom_dataframe_2(self, pd, pdt):
-        yaml_file = os.path.join('testfile_st.yaml')
-        yaml_filename = pkg_resources.resource_filename(__name__, yaml_file)
+        c = chemked_st.get_dataframe(cols_to_get)
+        df = csv_st_df[sorted(_custom_columns)]
+        pdt.assert_frame_equal(c.sort_index(axis=1), df, check_names=True)
+
+    def test_custom_dataframe_2(self, pdt, chemked_st, csv_st_df):
         cols_to_get = ['temperature', 'ignition delay', 'Pressure']
-        c = ChemKED(yaml_filename).get_dataframe(cols_to_get)
-        csv_file = os.path.join('dataframe_st.csv')
-        csv_filename = pkg_resources.resource_filename(__name__, csv_file)
-        converters = {
-            'Ignition Delay': Q_,
-            'Temperature': Q_,
-            'Pressure': Q_,
-            'H2': Q_,
-            'Ar': Q_,
-            'O2': Q_,
-        }
-        use_cols = ['Temperature', 'Ignition Delay', 'Pressure']
-        df = pd.read_csv(csv_filename, converters=converters, usecols=use_cols)
-        pdt.assert_frame_equal(c.sort_index(axis=1), df.sort_index(axis=1), check_names=True)
-
-    def test_invalid_column(self, pd):
-        yaml_file = os.path.join('testfile_st.yaml')
-        yaml_filename = pkg_resources.resource_filename(__name__, yaml_file)
+        c = chemked_st.get_dataframe(cols_to_get)
+        df = csv_st_df[sorted(_custom_columns_2)]
+        pdt.assert_frame_equal(c.sort_index(axis=1), df, check_names=True)
+
+    def test_invalid_column(self, pd, chemked_st):
         with pytest.raises(ValueError):
-            ChemKED(yaml_filename).get_dataframe(['bad column'])
+            chemked_st.get_dataframe(['bad column'])
 
     def test_many_species(self, pd):
         yaml_file = os.path.join('testfile_many_species.yaml')
-        yaml_filename = pkg_resources.resource_filename(__name__, yaml_file)
-        c = ChemKED(yaml_filename).get_dataframe()
+        yaml_filename = os.path.join(_test_dir, yaml_file)
+        c = ChemKED(yaml_filename, skip_validation=True).get_dataframe()
         assert c.iloc[0]['New-Species-1'] == Q_(0.0, 'dimensionless')
         assert c.iloc[0]['New-Species-2'] == Q_(0.0, 'dimensionless')
         assert c.iloc[1]['H2'] == Q_(0.0, 'dimensionless')
@@ -190,8 +330,8 @@ class TestWriteFile(object):
         """
         """
         yaml_file = 'testfile_st.yaml'
-        yaml_filename = pkg_resources.resource_filename(__name__, yaml_file)
-        c = ChemKED(yaml_filename)
+        yaml_filename = os.path.join(_test_dir, yaml_file)
+        c = ChemKED(yaml_filename, skip_validation=True)
 
         with pytest.raises(OSError):
             c.write_file(yaml_filename)
@@ -200,7 +340,7 @@ class TestWriteFile(object):
         """
         """
         yaml_file = 'testfile_st.yaml'
-        yaml_filename = pkg_resources.resource_filename(__name__, yaml_file)
+        yaml_filename = os.path.join(_test_dir, yaml_file)
         with open(yaml_filename, 'r') as f:
             lines = f.readlines()
 
@@ -208,7 +348,7 @@ class TestWriteFile(object):
             newfile_path = os.path.join(temp_dir, 'testfile.yaml')
             with open(newfile_path, 'w') as f:
                 f.writelines(lines)
-            c = ChemKED(newfile_path)
+            c = ChemKED(newfile_path, skip_validation=True)
 
             # Expected error
             with pytest.raises(OSError):
@@ -226,15 +366,15 @@ class TestWriteFile(object):
         """Test proper writing of ChemKED files.
         """
         file_path = os.path.join(filename)
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        c = ChemKED(filename)
+        filename = os.path.join(_test_dir, file_path)
+        c = ChemKED(filename, skip_validation=True)
 
         with TemporaryDirectory() as temp_dir:
             c.write_file(os.path.join(temp_dir, 'testfile.yaml'))
 
             # Now read in the file
             with open(os.path.join(temp_dir, 'testfile.yaml'), 'r') as f:
-                properties = yaml.safe_load(f)
+                properties = yaml.load(f, Loader=SafeLoader)
 
         assert properties == c._properties
 
@@ -247,8 +387,8 @@ class TestConvertToReSpecTh(object):
         """Test proper conversion to ReSpecTh XML.
         """
         file_path = os.path.join(filename_ck)
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        c_true = ChemKED(filename)
+        filename = os.path.join(_test_dir, file_path)
+        c_true = ChemKED(filename, skip_validation=True)
 
         with TemporaryDirectory() as temp_dir:
             newfile = os.path.join(temp_dir, 'test.xml')
@@ -270,16 +410,13 @@ class TestConvertToReSpecTh(object):
 
     @pytest.mark.parametrize('history_type, unit',
                              [('volume', 'cm3'), ('temperature', 'K'), ('pressure', 'bar')])
-    def test_time_history_conversion_to_respecth(self, history_type, unit):
+    def test_time_history_conversion_to_respecth(self, history_type, unit, load_yaml):
         """Test proper conversion to ReSpecTh XML with time histories.
         """
-        file_path = os.path.join('testfile_rcm.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        with open(filename, 'r') as yaml_file:
-            properties = yaml.safe_load(yaml_file)
+        properties = load_yaml('testfile_rcm.yaml')
         properties['datapoints'][0]['time-histories'][0]['type'] = history_type
         properties['datapoints'][0]['time-histories'][0]['quantity']['units'] = unit
-        c_true = ChemKED(dict_input=properties)
+        c_true = ChemKED(dict_input=properties, skip_validation=True)
 
         with TemporaryDirectory() as temp_dir:
             newfile = os.path.join(temp_dir, 'test.xml')
@@ -303,16 +440,13 @@ class TestConvertToReSpecTh(object):
     @pytest.mark.parametrize('history_type, unit',
                              zip(['piston position', 'light emission', 'OH emission', 'absorption'],
                                  ['cm', 'dimensionless', 'dimensionless', 'dimensionless']))
-    def test_time_history_conversion_to_respecth_unsupported(self, history_type, unit):
+    def test_time_history_conversion_to_respecth_unsupported(self, history_type, unit, load_yaml):
         """Test proper conversion to ReSpecTh XML with unsupported time histories.
         """
-        file_path = os.path.join('testfile_rcm.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        with open(filename, 'r') as yaml_file:
-            properties = yaml.safe_load(yaml_file)
+        properties = load_yaml('testfile_rcm.yaml')
         properties['datapoints'][0]['time-histories'][0]['type'] = history_type
         properties['datapoints'][0]['time-histories'][0]['quantity']['units'] = unit
-        c_true = ChemKED(dict_input=properties)
+        c_true = ChemKED(dict_input=properties, skip_validation=True)
         with TemporaryDirectory() as temp_dir:
             newfile = os.path.join(temp_dir, 'test.xml')
             with pytest.warns(UserWarning) as record:
@@ -341,12 +475,10 @@ class TestConvertToReSpecTh(object):
         'Outlet concentration measurement', 'Burner stabilized flame speciation measurement',
         'Jet-stirred reactor measurement', 'Reaction rate coefficient measurement'
         ])
-    def test_conversion_to_respecth_error(self, experiment_type):
+    def test_conversion_to_respecth_error(self, experiment_type, load_yaml):
         """Test for conversion errors.
         """
-        file_path = os.path.join('testfile_st.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        c = ChemKED(filename)
+        c = ChemKED(dict_input=load_yaml('testfile_st.yaml'), skip_validation=True)
 
         c.experiment_type = experiment_type
 
@@ -358,23 +490,25 @@ class TestConvertToReSpecTh(object):
         """Test for appropriate handling of composition with missing InChI.
         """
         file_path = os.path.join('testfile_st.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        c = ChemKED(filename)
-
-        for idx, dp in enumerate(c.datapoints):
-            c.datapoints[idx].composition = dict(
-                H2=Composition(**{'amount': Q_(0.1, 'dimensionless'), 'species_name': 'H2',
-                                  'InChI': None, 'SMILES': None, 'atomic_composition': None}),
-                O2=Composition(**{'amount': Q_(0.1, 'dimensionless'), 'species_name': 'O2',
-                                  'InChI': None, 'SMILES': None, 'atomic_composition': None}),
-                Ar=Composition(**{'amount': Q_(0.8, 'dimensionless'), 'species_name': 'Ar',
-                                  'InChI': None, 'SMILES': None, 'atomic_composition': None})
-            )
+        filename = os.path.join(_test_dir, file_path)
+        c = ChemKED(filename, skip_validation=True)
+
+        # Composition is an immutable namedtuple, so every datapoint can share the same entries
+        composition = dict(
+            H2=Composition(**{'amount': Q_(0.1, 'dimensionless'), 'species_name': 'H2',
+                              'InChI': None, 'SMILES': None, 'atomic_composition': None}),
+            O2=Composition(**{'amount': Q_(0.1, 'dimensionless'), 'species_name': 'O2',
+                              'InChI': None, 'SMILES': None, 'atomic_composition': None}),
+            Ar=Composition(**{'amount': Q_(0.8, 'dimensionless'), 'species_name': 'Ar',
+                              'InChI': None, 'SMILES': None, 'atomic_composition': None})
+        )
+        for dp in c.datapoints:
+            dp.composition = dict(composition)
 
         with TemporaryDirectory() as temp_dir:
             newfile = os.path.join(temp_dir, 'test.xml')
             c.convert_to_ReSpecTh(newfile)
-            tree = etree.parse(newfile)
+            tree = etree.parse(newfile, parser=_xml_parser)
         root = tree.getroot()
 
         with pytest.warns(UserWarning) as record:
@@ -394,8 +528,8 @@ class TestConvertToReSpecTh(object):
         """Test for appropriate handling of datapoints with different composition.
         """
         file_path = os.path.join('testfile_st.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        c = ChemKED(filename)
+        filename = os.path.join(_test_dir, file_path)
+        c = ChemKED(filename, skip_validation=True)
 
         c.datapoints[0].composition = {'H2': Composition(**{'InChI': '1S/H2/h1H',
                                         'amount': Q_(0.1, 'dimensionless'),
@@ -412,7 +546,7 @@ class TestConvertToReSpecTh(object):
             newfile = os.path.join(temp_dir, 'test.xml')
             c.convert_to_ReSpecTh(newfile)
 
-            tree = etree.parse(newfile)
+            tree = etree.parse(newfile, parser=_xml_parser)
         root = tree.getroot()
         with pytest.warns(UserWarning) as record:
             datapoints = get_datapoints(root)
@@ -436,8 +570,8 @@ class TestConvertToReSpecTh(object):
         """Test for appropriate erorr of datapoints with different composition type.
         """
         file_path = os.path.join('testfile_st.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        c = ChemKED(filename)
+        filename = os.path.join(_test_dir, file_path)
+        c = ChemKED(filename, skip_validation=True)
         c.datapoints[0].composition_type = 'mass fraction'
 
         with pytest.raises(NotImplementedError) as excinfo:
@@ -449,8 +583,8 @@ class TestConvertToReSpecTh(object):
         """Test for error raised if RCM with multiple datapoints with volume history.
         """
         file_path = os.path.join('testfile_rcm.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        c = ChemKED(filename)
+        filename = os.path.join(_test_dir, file_path)
+        c = ChemKED(filename, skip_validation=True)
 
         # Repeat datapoint, such that two with volume histories
         c.datapoints.append(c.datapoints[0])
@@ -462,12 +596,10 @@ class TestConvertToReSpecTh(object):
                 )
 
     @pytest.mark.parametrize('ignition_target', ['pressure', 'temperature', 'OH', 'CH', 'OH*', 'CH*'])
-    def test_conversion_to_respecth_ignition_targets(self, ignition_target):
+    def test_conversion_to_respecth_ignition_targets(self, ignition_target, load_yaml):
         """Test proper conversion for different ignition targets.
         """
-        file_path = os.path.join('testfile_st.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        c = ChemKED(filename)
+        c = ChemKED(dict_input=load_yaml('testfile_st.yaml'), skip_validation=True)
 
         for dp in c.datapoints:
             dp.ignition_type['target'] = ignition_target
@@ -476,7 +608,7 @@ class TestConvertToReSpecTh(object):
             newfile = os.path.join(temp_dir, 'test.xml')
             c.convert_to_ReSpecTh(newfile)
 
-            tree = etree.parse(newfile)
+            tree = etree.parse(newfile, parser=_xml_parser)
         root = tree.getroot()
         elem = root.find('ignitionType')
         elem = elem.attrib
@@ -489,12 +621,10 @@ class TestConvertToReSpecTh(object):
             assert elem['target'] == ignition_target
 
     @pytest.mark.parametrize('ignition_type', ['d/dt max', 'max', '1/2 max', 'min', 'd/dt max extrapolated'])
-    def test_conversion_to_respecth_ignition_types(self, ignition_type):
+    def test_conversion_to_respecth_ignition_types(self, ignition_type, load_yaml):
         """Test proper conversion for different ignition types.
         """
-        file_path = os.path.join('testfile_st.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        c = ChemKED(filename)
+        c = ChemKED(dict_input=load_yaml('testfile_st.yaml'), skip_validation=True)
 
         for dp in c.datapoints:
             dp.ignition_type['type'] = ignition_type
@@ -503,7 +633,7 @@ class TestConvertToReSpecTh(object):
             newfile = os.path.join(temp_dir, 'test.xml')
             c.convert_to_ReSpecTh(newfile)
 
-            tree = etree.parse(newfile)
+            tree = etree.parse(newfile, parser=_xml_parser)
         root = tree.getroot()
         elem = root.find('ignitionType')
         elem = elem.attrib
@@ -517,8 +647,8 @@ class TestConvertToReSpecTh(object):
         """Test that multiple ignition targets for datapoints fails
         """
         file_path = os.path.join('testfile_st.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        c = ChemKED(filename)
+        filename = os.path.join(_test_dir, file_path)
+        c = ChemKED(filename, skip_validation=True)
 
         c.datapoints[0].ignition_type['target'] = 'temperature'
         with TemporaryDirectory() as temp_dir:
@@ -533,21 +663,22 @@ class TestConvertToReSpecTh(object):
 class TestDataPoint(object):
     """
     """
-    def load_properties(self, test_file):
-        file_path = os.path.join(test_file)
-        filename = pkg_resources.resource_filename(__name__, file_path)
-        with open(filename, 'r') as f:
-            properties = yaml.safe_load(f)
+    @pytest.fixture(autouse=True)
+    def _datapoint_loader(self, load_yaml):
+        self._load_yaml = load_yaml
 
-        v = OurValidator(schema)
-        if not v.validate(properties):
-            raise ValueError(v.errors)
+    def load_properties(self, test_file):
+        """Datapoints of a test file, without schema validation.
 
-        return properties['datapoints']
+        Several tests modify the datapoints, so each call returns a new copy.
+        """
+        return self._load_yaml(test_file)['datapoints']
 
     def test_create_datapoint(self):
-        properties = self.load_properties('testfile_required.yaml')
-        DataPoint(properties[0])
+        properties = self._load_yaml('testfile_required.yaml')
+        if not v.validate(properties):
+            raise ValueError(v.errors)
+        DataPoint(properties['datapoints'][0])
 
     def test_cantera_unknown_composition_type(self):
         properties = self.load_properties('testfile_required.yaml')
@@ -701,78 +832,78 @@ class TestDataPoint(object):
         properties = self.load_properties('testfile_required.yaml')
         d = DataPoint(properties[2])
         assert len(d.composition) == 3
-        assert np.isclose(d.composition['H2'].amount, Q_(0.444))
+        assert _magnitudes_close(d.composition['H2'].amount, Q_(0.444))
         assert d.composition['H2'].species_name == 'H2'
-        assert np.isclose(d.composition['O2'].amount, Q_(0.556))
+        assert _magnitudes_close(d.composition['O2'].amount, Q_(0.556))
         assert d.composition['O2'].species_name == 'O2'
-        assert np.isclose(d.composition['Ar'].amount, Q_(99.0))
+        assert _magnitudes_close(d.composition['Ar'].amount, Q_(99.0))
         assert d.composition['Ar'].species_name == 'Ar'
 
     def test_ignition_delay(self):
         properties = self.load_properties('testfile_required.yaml')
         d = DataPoint(properties[0])
-        assert np.isclose(d.ignition_delay, Q_(471.54, 'us'))
+        assert _magnitudes_close(d.ignition_delay, Q_(471.54, 'us'))
 
     def test_first_stage_ignition_delay(self):
         properties = self.load_properties('testfile_rcm2.yaml')
         d = DataPoint(properties[0])
-        assert np.isclose(d.first_stage_ignition_delay.value, Q_(0.5, 'ms'))
-        assert np.isclose(d.first_stage_ignition_delay.error, Q_(0.005, 'ms'))
+        assert _magnitudes_close(d.first_stage_ignition_delay.value, Q_(0.5, 'ms'))
+        assert _magnitudes_close(d.first_stage_ignition_delay.error, Q_(0.005, 'ms'))
 
     def test_temperature(self):
         properties = self.load_properties('testfile_required.yaml')
         d = DataPoint(properties[0])
-        assert np.isclose(d.temperature, Q_(1164.48, 'K'))
+        assert _magnitudes_close(d.temperature, Q_(1164.48, 'K'))
 
     def test_rcm_data(self):
         properties = self.load_properties('testfile_rcm2.yaml')
         d = DataPoint(properties[0])
-        assert np.isclose(d.rcm_data.compression_time, Q_(38.0, 'ms'))
-        assert np.isclose(d.rcm_data.compressed_temperature.value, Q_(765, 'K'))
-        assert np.isclose(d.rcm_data.compressed_temperature.error, Q_(7.65, 'K'))
-        assert np.isclose(d.rcm_data.compressed_pressure, Q_(7.1, 'bar'))
-        assert np.isclose(d.rcm_data.stroke, Q_(10.0, 'inch'))
-        assert np.isclose(d.rcm_data.clearance, Q_(2.5, 'cm'))
-        assert np.isclose(d.rcm_data.compression_ratio, Q_(12.0, 'dimensionless'))
+        assert _magnitudes_close(d.rcm_data.compression_time, Q_(38.0, 'ms'))
+        assert _magnitudes_close(d.rcm_data.compressed_temperature.value, Q_(765, 'K'))
+        assert _magnitudes_close(d.rcm_data.compressed_temperature.error, Q_(7.65, 'K'))
+        assert _magnitudes_close(d.rcm_data.compressed_pressure, Q_(7.1, 'bar'))
+        assert _magnitudes_close(d.rcm_data.stroke, Q_(10.0, 'inch'))
+        assert _magnitudes_close(d.rcm_data.clearance, Q_(2.5, 'cm'))
+        assert _magnitudes_close(d.rcm_data.compression_ratio, Q_(12.0, 'dimensionless'))
 
     def test_pressure(self):
         properties = self.load_properties('testfile_required.yaml')
         d = DataPoint(properties[0])
-        assert np.isclose(d.pressure, Q_(220.0, 'kPa'))
+        assert _magnitudes_close(d.pressure, Q_(220.0, 'kPa'))
 
     def test_pressure_rise(self):
         properties = self.load_properties('testfile_st2.yaml')
         d = DataPoint(properties[0])
-        assert np.isclose(d.pressure_rise, Q_(0.1, '1/ms'))
+        assert _magnitudes_close(d.pressure_rise, Q_(0.1, '1/ms'))
 
     @pytest.mark.filterwarnings('ignore:Asymmetric uncertainties')
     def test_absolute_sym_uncertainty(self):
         properties = self.load_properties('testfile_uncertainty.yaml')
         d = DataPoint(properties[0])
-        assert np.isclose(d.temperature.value, Q_(1164.48, 'K'))
-        assert np.isclose(d.temperature.error, Q_(10, 'K'))
+        assert _magnitudes_close(d.temperature.value, Q_(1164.48, 'K'))
+        assert _magnitudes_close(d.temperature.error, Q_(10, 'K'))
 
     @pytest.mark.filterwarnings('ignore:Asymmetric uncertainties')
     def test_absolute_sym_comp_uncertainty(self):
         properties = self.load_properties('testfile_uncertainty.yaml')
         d = DataPoint(properties[0])
-        assert np.isclose(d.composition['O2'].amount.value, Q_(0.556))
-        assert np.isclose(d.composition['O2'].amount.error, Q_(0.002))
+        assert _magnitudes_close(d.composition['O2'].amount.value, Q_(0.556))
+        assert _magnitudes_close(d.composition['O2'].amount.error, Q_(0.002))
 
     @pytest.mark.filterwarnings('ignore:Asymmetric uncertainties')
     def test_relative_sym_uncertainty(self):
         properties = self.load_properties('testfile_uncertainty.yaml')
         d = DataPoint(properties[1])
-        assert np.isclose(d.ignition_delay.value, Q_(471.54, 'us'))
-        assert np.isclose(d.ignition_delay.error, Q_(47.154, 'us'))
+        assert _magnitudes_close(d.ignition_delay.value, Q_(471.54, 'us'))
+        assert _magnitudes_close(d.ignition_delay.error, Q_(47.154, 'us'))
         assert np.isclose(d.ignition_delay.rel, 0.1)
 
     @pytest.mark.filterwarnings('ignore:Asymmetric uncertainties')
     def test_relative_sym_comp_uncertainty(self):
         properties = self.load_properties('testfile_uncertainty.yaml')
         d = DataPoint(properties[0])
-        assert np.isclose(d.composition['H2'].amount.value, Q_(0.444))
-        assert np.isclose(d.composition['H2'].amount.error, Q_(0.00444))
+        assert _magnitudes_close(d.composition['H2'].amount.value, Q_(0.444))
+        assert _magnitudes_close(d.composition['H2'].amount.error, Q_(0.00444))
         assert np.isclose(d.composition['H2'].amount.rel, 0.01)
 
     def test_absolute_asym_uncertainty(self):
@@ -782,10 +913,10 @@ class TestDataPoint(object):
         m = str(record.pop(UserWarning).message)
         assert m == ('Asymmetric uncertainties are not supported. The maximum of lower-uncertainty '
                      'and upper-uncertainty has been used as the symmetric uncertainty.')
-        assert np.isclose(d.temperature.value, Q_(1164.48, 'K'))
-        assert np.isclose(d.temperature.error, Q_(10, 'K'))
-        assert np.isclose(d.ignition_delay.value, Q_(471.54, 'us'))
-        assert np.isclose(d.ignition_delay.error, Q_(10, 'us'))
+        assert _magnitudes_close(d.temperature.value, Q_(1164.48, 'K'))
+        assert _magnitudes_close(d.temperature.error, Q_(10, 'K'))
+        assert _magnitudes_close(d.ignition_delay.value, Q_(471.54, 'us'))
+        assert _magnitudes_close(d.ignition_delay.error, Q_(10, 'us'))
 
     def test_relative_asym_uncertainty(self):
         properties = self.load_properties('testfile_uncertainty.yaml')
@@ -794,11 +925,11 @@ class TestDataPoint(object):
         m = str(record.pop(UserWarning).message)
         assert m == ('Asymmetric uncertainties are not supported. The maximum of lower-uncertainty '
                      'and upper-uncertainty has been used as the symmetric uncertainty.')
-        assert np.isclose(d.ignition_delay.value, Q_(471.54, 'us'))
-        assert np.isclose(d.ignition_delay.error, Q_(47.154, 'us'))
+        assert _magnitudes_close(d.ignition_delay.value, Q_(471.54, 'us'))
+        assert _magnitudes_close(d.ignition_delay.error, Q_(47.154, 'us'))
         assert np.isclose(d.ignition_delay.rel, 0.1)
-        assert np.isclose(d.temperature.value, Q_(1164.48, 'K'))
-        assert np.isclose(d.temperature.error, Q_(116.448, 'K'))
+        assert _magnitudes_close(d.temperature.value, Q_(1164.48, 'K'))
+        assert _magnitudes_close(d.temperature.error, Q_(116.448, 'K'))
         assert np.isclose(d.temperature.rel, 0.1)
 
     def test_absolute_asym_comp_uncertainty(self):
@@ -808,16 +939,16 @@ class TestDataPoint(object):
         m = str(record.pop(UserWarning).message)
         assert m == ('Asymmetric uncertainties are not supported. The maximum of lower-uncertainty '
                      'and upper-uncertainty has been used as the symmetric uncertainty.')
-        assert np.isclose(d.composition['Ar'].amount.value, Q_(99.0))
-        assert np.isclose(d.composition['Ar'].amount.error, Q_(1.0))
 
         with pytest.warns(UserWarning) as record:
-            d = DataPoint(properties[1])
+            d_1 = DataPoint(properties[1])
         m = str(record.pop(UserWarning).message)
         assert m == ('Asymmetric uncertainties are not supported. The maximum of lower-uncertainty '
                      'and upper-uncertainty has been used as the symmetric uncertainty.')
-        assert np.isclose(d.composition['Ar'].amount.value, Q_(99.0))
-        assert np.isclose(d.composition['Ar'].amount.error, Q_(1.0))
+
+        amounts = [d.composition['Ar'].amount, d_1.composition['Ar'].amount]
+        assert np.allclose([a.value.magnitude for a in amounts], 99.0)
+        assert np.allclose([a.error.magnitude for a in amounts], 1.0)
 
     def test_relative_asym_comp_uncertainty(self):
         properties = self.load_properties('testfile_uncertainty.yaml')
@@ -826,13 +957,10 @@ class TestDataPoint(object):
         m = str(record.pop(UserWarning).message)
         assert m == ('Asymmetric uncertainties are not supported. The maximum of lower-uncertainty '
                      'and upper-uncertainty has been used as the symmetric uncertainty.')
-        assert np.isclose(d.composition['H2'].amount.value, Q_(0.444))
-        assert np.isclose(d.composition['H2'].amount.error, Q_(0.0444))
-        assert np.isclose(d.composition['H2'].amount.rel, 0.1)
-
-        assert np.isclose(d.composition['O2'].amount.value, Q_(0.556))
-        assert np.isclose(d.composition['O2'].amount.error, Q_(0.0556))
-        assert np.isclose(d.composition['O2'].amount.rel, 0.1)
+        amounts = [d.composition[s].amount for s in ('H2', 'O2')]
+        assert np.allclose([a.value.magnitude for a in amounts], [0.444, 0.556])
+        assert np.allclose([a.error.magnitude for a in amounts], [0.0444, 0.0556])
+        assert np.allclose([a.rel for a in amounts], 0.1)
 
     @pytest.mark.filterwarnings('ignore:Asymmetric uncertainties')
     def test_missing_uncertainty_parts(self):
@@ -860,29 +988,17 @@ class TestDataPoint(object):
             properties[1]['ignition-delay'][1][prop] = save
 
     @pytest.mark.filterwarnings('ignore:Asymmetric uncertainties')
-    def test_missing_comp_uncertainty_parts(self):
+    @pytest.mark.parametrize('dp_index, species_index, prop', [
+        (0, 0, 'uncertainty'), (0, 0, 'uncertainty-type'),
+        (0, 1, 'uncertainty'), (0, 1, 'uncertainty-type'),
+        (0, 2, 'upper-uncertainty'), (0, 2, 'lower-uncertainty'),
+        (1, 2, 'upper-uncertainty'), (1, 2, 'lower-uncertainty'),
+    ])
+    def test_missing_comp_uncertainty_parts(self, dp_index, species_index, prop):
         properties = self.load_properties('testfile_uncertainty.yaml')
-        for prop in ['uncertainty', 'uncertainty-type']:
-            save = properties[0]['composition']['species'][0]['amount'][1].pop(prop)
-            with pytest.raises(ValueError):
-                DataPoint(properties[0])
-            properties[0]['composition']['species'][0]['amount'][1][prop] = save
-
-            save = properties[0]['composition']['species'][1]['amount'][1].pop(prop)
-            with pytest.raises(ValueError):
-                DataPoint(properties[0])
-            properties[0]['composition']['species'][1]['amount'][1][prop] = save
-
-        for prop in ['upper-uncertainty', 'lower-uncertainty']:
-            save = properties[0]['composition']['species'][2]['amount'][1].pop(prop)
-            with pytest.raises(ValueError):
-                DataPoint(properties[0])
-            properties[0]['composition']['species'][2]['amount'][1][prop] = save
-
-            save = properties[1]['composition']['species'][2]['amount'][1].pop(prop)
-            with pytest.raises(ValueError):
-                DataPoint(properties[1])
-            properties[1]['composition']['species'][2]['amount'][1][prop] = save
+        properties[dp_index]['composition']['species'][species_index]['amount'][1].pop(prop)
+        with pytest.raises(ValueError):
+            DataPoint(properties[dp_index])
 
     def test_volume_history(self):
         """Test that volume history works properly.
@@ -897,44 +1013,10 @@ class TestDataPoint(object):
                      'volume-history will be removed after PyKED 0.4')
         # Check other data group with volume history
         np.testing.assert_allclose(d.volume_history.time,
-                                   Q_(np.arange(0, 9.7e-2, 1.e-3), 's')
+                                   Q_(_rcm_times, 's')
                                    )
 
-        volumes = Q_(np.array([
-            5.47669375000E+002, 5.46608789894E+002, 5.43427034574E+002,
-            5.38124109043E+002, 5.30700013298E+002, 5.21154747340E+002,
-            5.09488311170E+002, 4.95700704787E+002, 4.79791928191E+002,
-            4.61761981383E+002, 4.41610864362E+002, 4.20399162234E+002,
-            3.99187460106E+002, 3.77975757979E+002, 3.56764055851E+002,
-            3.35552353723E+002, 3.14340651596E+002, 2.93128949468E+002,
-            2.71917247340E+002, 2.50705545213E+002, 2.29493843085E+002,
-            2.08282140957E+002, 1.87070438830E+002, 1.65858736702E+002,
-            1.44647034574E+002, 1.23435332447E+002, 1.02223630319E+002,
-            8.10119281915E+001, 6.33355097518E+001, 5.27296586879E+001,
-            4.91943750000E+001, 4.97137623933E+001, 5.02063762048E+001,
-            5.06454851923E+001, 5.10218564529E+001, 5.13374097598E+001,
-            5.16004693977E+001, 5.18223244382E+001, 5.20148449242E+001,
-            5.21889350372E+001, 5.23536351113E+001, 5.25157124459E+001,
-            5.26796063730E+001, 5.28476160610E+001, 5.30202402028E+001,
-            5.31965961563E+001, 5.33748623839E+001, 5.35527022996E+001,
-            5.37276399831E+001, 5.38973687732E+001, 5.40599826225E+001,
-            5.42141273988E+001, 5.43590751578E+001, 5.44947289126E+001,
-            5.46215686913E+001, 5.47405518236E+001, 5.48529815402E+001,
-            5.49603582190E+001, 5.50642270863E+001, 5.51660349836E+001,
-            5.52670070646E+001, 5.53680520985E+001, 5.54697025392E+001,
-            5.55720927915E+001, 5.56749762728E+001, 5.57777790517E+001,
-            5.58796851466E+001, 5.59797461155E+001, 5.60770054561E+001,
-            5.61706266985E+001, 5.62600130036E+001, 5.63449057053E+001,
-            5.64254496625E+001, 5.65022146282E+001, 5.65761642150E+001,
-            5.66485675508E+001, 5.67208534842E+001, 5.67944133373E+001,
-            5.68703658198E+001, 5.69493069272E+001, 5.70310785669E+001,
-            5.71146023893E+001, 5.71978399741E+001, 5.72779572372E+001,
-            5.73517897984E+001, 5.74167271960E+001, 5.74721573687E+001,
-            5.75216388520E+001, 5.75759967785E+001, 5.76575701358E+001,
-            5.78058719368E+001, 5.80849611077E+001, 5.85928651155E+001,
-            5.94734357453E+001, 6.09310671165E+001, 6.32487551103E+001,
-            6.68100309742E+001
-            ]), 'cm**3')
+        volumes = Q_(_rcm_volumes, 'cm**3')
         np.testing.assert_allclose(d.volume_history.volume, volumes)
 
     def test_time_and_volume_histories_error(self):
@@ -957,44 +1039,10 @@ class TestDataPoint(object):
         d = DataPoint(properties[0])
 
         np.testing.assert_allclose(getattr(d, '{}_history'.format(history_type)).time,
-                                   Q_(np.arange(0, 9.7e-2, 1.e-3), 's')
+                                   Q_(_rcm_times, 's')
                                    )
 
-        quants = Q_(np.array([
-            5.47669375000E+002, 5.46608789894E+002, 5.43427034574E+002,
-            5.38124109043E+002, 5.30700013298E+002, 5.21154747340E+002,
-            5.09488311170E+002, 4.95700704787E+002, 4.79791928191E+002,
-            4.61761981383E+002, 4.41610864362E+002, 4.20399162234E+002,
-            3.99187460106E+002, 3.77975757979E+002, 3.56764055851E+002,
-            3.35552353723E+002, 3.14340651596E+002, 2.93128949468E+002,
-            2.71917247340E+002, 2.50705545213E+002, 2.29493843085E+002,
-            2.08282140957E+002, 1.87070438830E+002, 1.65858736702E+002,
-            1.44647034574E+002, 1.23435332447E+002, 1.02223630319E+002,
-            8.10119281915E+001, 6.33355097518E+001, 5.27296586879E+001,
-            4.91943750000E+001, 4.97137623933E+001, 5.02063762048E+001,
-            5.06454851923E+001, 5.10218564529E+001, 5.13374097598E+001,
-            5.16004693977E+001, 5.18223244382E+001, 5.20148449242E+001,
-            5.21889350372E+001, 5.23536351113E+001, 5.25157124459E+001,
-            5.26796063730E+001, 5.28476160610E+001, 5.30202402028E+001,
-            5.31965961563E+001, 5.33748623839E+001, 5.35527022996E+001,
-            5.37276399831E+001, 5.38973687732E+001, 5.40599826225E+001,
-            5.42141273988E+001, 5.43590751578E+001, 5.44947289126E+001,
-            5.46215686913E+001, 5.47405518236E+001, 5.48529815402E+001,
-            5.49603582190E+001, 5.50642270863E+001, 5.51660349836E+001,
-            5.52670070646E+001, 5.53680520985E+001, 5.54697025392E+001,
-            5.55720927915E+001, 5.56749762728E+001, 5.57777790517E+001,
-            5.58796851466E+001, 5.59797461155E+001, 5.60770054561E+001,
-            5.61706266985E+001, 5.62600130036E+001, 5.63449057053E+001,
-            5.64254496625E+001, 5.65022146282E+001, 5.65761642150E+001,
-            5.66485675508E+001, 5.67208534842E+001, 5.67944133373E+001,
-            5.68703658198E+001, 5.69493069272E+001, 5.70310785669E+001,
-            5.71146023893E+001, 5.71978399741E+001, 5.72779572372E+001,
-            5.73517897984E+001, 5.74167271960E+001, 5.74721573687E+001,
-            5.75216388520E+001, 5.75759967785E+001, 5.76575701358E+001,
-            5.78058719368E+001, 5.80849611077E+001, 5.85928651155E+001,
-            5.94734357453E+001, 6.09310671165E+001, 6.32487551103E+001,
-            6.68100309742E+001
-            ]), 'cm**3')
+        quants = Q_(_rcm_volumes, 'cm**3')
         np.testing.assert_allclose(getattr(d, '{}_history'.format(history_type)).quantity, quants)
         assert all([getattr(d, '{}_history'.format(h)) is None for h in self.time_history_types if h != history_type])
 
@@ -1004,49 +1052,15 @@ class TestDataPoint(object):
         properties = self.load_properties('testfile_rcm.yaml')
         properties[0]['time-histories'][0]['type'] = history_type
         file_path = os.path.join('rcm_history.csv')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
         properties[0]['time-histories'][0]['values'] = {'filename': filename}
         d = DataPoint(properties[0])
 
         np.testing.assert_allclose(getattr(d, '{}_history'.format(history_type)).time,
-                                   Q_(np.arange(0, 9.7e-2, 1.e-3), 's')
+                                   Q_(_rcm_times, 's')
                                    )
 
-        quants = Q_(np.array([
-            5.47669375000E+002, 5.46608789894E+002, 5.43427034574E+002,
-            5.38124109043E+002, 5.30700013298E+002, 5.21154747340E+002,
-            5.09488311170E+002, 4.95700704787E+002, 4.79791928191E+002,
-            4.61761981383E+002, 4.41610864362E+002, 4.20399162234E+002,
-            3.99187460106E+002, 3.77975757979E+002, 3.56764055851E+002,
-            3.35552353723E+002, 3.14340651596E+002, 2.93128949468E+002,
-            2.71917247340E+002, 2.50705545213E+002, 2.29493843085E+002,
-            2.08282140957E+002, 1.87070438830E+002, 1.65858736702E+002,
-            1.44647034574E+002, 1.23435332447E+002, 1.02223630319E+002,
-            8.10119281915E+001, 6.33355097518E+001, 5.27296586879E+001,
-            4.91943750000E+001, 4.97137623933E+001, 5.02063762048E+001,
-            5.06454851923E+001, 5.10218564529E+001, 5.13374097598E+001,
-            5.16004693977E+001, 5.18223244382E+001, 5.20148449242E+001,
-            5.21889350372E+001, 5.23536351113E+001, 5.25157124459E+001,
-            5.26796063730E+001, 5.28476160610E+001, 5.30202402028E+001,
-            5.31965961563E+001, 5.33748623839E+001, 5.35527022996E+001,
-            5.37276399831E+001, 5.38973687732E+001, 5.40599826225E+001,
-            5.42141273988E+001, 5.43590751578E+001, 5.44947289126E+001,
-            5.46215686913E+001, 5.47405518236E+001, 5.48529815402E+001,
-            5.49603582190E+001, 5.50642270863E+001, 5.51660349836E+001,
-            5.52670070646E+001, 5.53680520985E+001, 5.54697025392E+001,
-            5.55720927915E+001, 5.56749762728E+001, 5.57777790517E+001,
-            5.58796851466E+001, 5.59797461155E+001, 5.60770054561E+001,
-            5.61706266985E+001, 5.62600130036E+001, 5.63449057053E+001,
-            5.64254496625E+001, 5.65022146282E+001, 5.65761642150E+001,
-            5.66485675508E+001, 5.67208534842E+001, 5.67944133373E+001,
-            5.68703658198E+001, 5.69493069272E+001, 5.70310785669E+001,
-            5.71146023893E+001, 5.71978399741E+001, 5.72779572372E+001,
-            5.73517897984E+001, 5.74167271960E+001, 5.74721573687E+001,
-            5.75216388520E+001, 5.75759967785E+001, 5.76575701358E+001,
-            5.78058719368E+001, 5.80849611077E+001, 5.85928651155E+001,
-            5.94734357453E+001, 6.09310671165E+001, 6.32487551103E+001,
-            6.68100309742E+001
-            ]), 'cm**3')
+        quants = Q_(_rcm_volumes, 'cm**3')
         np.testing.assert_allclose(getattr(d, '{}_history'.format(history_type)).quantity, quants)
         assert all([getattr(d, '{}_history'.format(h)) is None for h in self.time_history_types if h != history_type])
 
@@ -1064,46 +1078,12 @@ class TestDataPoint(object):
         d = DataPoint(properties[0])
 
         np.testing.assert_allclose(getattr(d, '{}_history'.format(history_type[0])).time,
-                                   Q_(np.arange(0, 9.7e-2, 1.e-3), 's'))
+                                   Q_(_rcm_times, 's'))
 
         np.testing.assert_allclose(getattr(d, '{}_history'.format(history_type[1])).time,
-                                   Q_(np.arange(0, 9.7e-2, 1.e-3), 's'))
-
-        quants = Q_(np.array([
-            5.47669375000E+002, 5.46608789894E+002, 5.43427034574E+002,
-            5.38124109043E+002, 5.30700013298E+002, 5.21154747340E+002,
-            5.09488311170E+002, 4.95700704787E+002, 4.79791928191E+002,
-            4.61761981383E+002, 4.41610864362E+002, 4.20399162234E+002,
-            3.99187460106E+002, 3.77975757979E+002, 3.56764055851E+002,
-            3.35552353723E+002, 3.14340651596E+002, 2.93128949468E+002,
-            2.71917247340E+002, 2.50705545213E+002, 2.29493843085E+002,
-            2.08282140957E+002, 1.87070438830E+002, 1.65858736702E+002,
-            1.44647034574E+002, 1.23435332447E+002, 1.02223630319E+002,
-            8.10119281915E+001, 6.33355097518E+001, 5.27296586879E+001,
-            4.91943750000E+001, 4.97137623933E+001, 5.02063762048E+001,
-            5.06454851923E+001, 5.10218564529E+001, 5.13374097598E+001,
-            5.16004693977E+001, 5.18223244382E+001, 5.20148449242E+001,
-            5.21889350372E+001, 5.23536351113E+001, 5.25157124459E+001,
-            5.26796063730E+001, 5.28476160610E+001, 5.30202402028E+001,
-            5.31965961563E+001, 5.33748623839E+001, 5.35527022996E+001,
-            5.37276399831E+001, 5.38973687732E+001, 5.40599826225E+001,
-            5.42141273988E+001, 5.43590751578E+001, 5.44947289126E+001,
-            5.46215686913E+001, 5.47405518236E+001, 5.48529815402E+001,
-            5.49603582190E+001, 5.50642270863E+001, 5.51660349836E+001,
-            5.52670070646E+001, 5.53680520985E+001, 5.54697025392E+001,
-            5.55720927915E+001, 5.56749762728E+001, 5.57777790517E+001,
-            5.58796851466E+001, 5.59797461155E+001, 5.60770054561E+001,
-            5.61706266985E+001, 5.62600130036E+001, 5.63449057053E+001,
-            5.64254496625E+001, 5.65022146282E+001, 5.65761642150E+001,
-            5.66485675508E+001, 5.67208534842E+001, 5.67944133373E+001,
-            5.68703658198E+001, 5.69493069272E+001, 5.70310785669E+001,
-            5.71146023893E+001, 5.71978399741E+001, 5.72779572372E+001,
-            5.73517897984E+001, 5.74167271960E+001, 5.74721573687E+001,
-            5.75216388520E+001, 5.75759967785E+001, 5.76575701358E+001,
-            5.78058719368E+001, 5.80849611077E+001, 5.85928651155E+001,
-            5.94734357453E+001, 6.09310671165E+001, 6.32487551103E+001,
-            6.68100309742E+001
-            ]), 'cm**3')
+                                   Q_(_rcm_times, 's'))
+
+        quants = Q_(_rcm_volumes, 'cm**3')
         np.testing.assert_allclose(getattr(d, '{}_history'.format(history_type[0])).quantity, quants)
         np.testing.assert_allclose(getattr(d, '{}_history'.format(history_type[1])).quantity, quants)
         assert all([getattr(d, '{}_history'.format(h)) is None for h in self.time_history_types if h not in history_type])
@@ -1120,37 +1100,18 @@ class TestDataPoint(object):
         assert ('Each history type may only be specified once. {} was '
                 'specified multiple times'.format(history_type[0])) in str(record.value)
 
-    def test_supported_ignition_types(self):
-        # pressure d/dt max
-        properties = self.load_properties('testfile_st.yaml')
-        datapoints = [DataPoint(d) for d in properties]
-        for d in datapoints:
-            assert d.ignition_type['target'] == 'pressure'
-            assert d.ignition_type['type'] == 'd/dt max'
-
-        # OH, max
-        properties = self.load_properties('testfile_st2.yaml')
+    @pytest.mark.parametrize('filename, ignition_types', [
+        ('testfile_st.yaml', [('pressure', 'd/dt max')] * 5),
+        ('testfile_st2.yaml', [('OH', 'max')]),
+        ('testfile_st_p5.yaml', [('OH*', '1/2 max')] * 4),
+        ('testfile_required.yaml', [('CH', 'min'), ('CH*', 'd/dt max extrapolated'),
+                                    ('pressure', 'd/dt max')]),
+    ])
+    def test_supported_ignition_types(self, filename, ignition_types):
+        properties = self.load_properties(filename)
         datapoints = [DataPoint(d) for d in properties]
-        for d in datapoints:
-            assert d.ignition_type['target'] == 'OH'
-            assert d.ignition_type['type'] == 'max'
-
-        # OH*, 1/2 max
-        properties = self.load_properties('testfile_st_p5.yaml')
-        datapoints = [DataPoint(d) for d in properties]
-        for d in datapoints:
-            assert d.ignition_type['target'] == 'OH*'
-            assert d.ignition_type['type'] == '1/2 max'
-
-        # CH, min
-        properties = self.load_properties('testfile_required.yaml')
-        datapoints = [DataPoint(d) for d in properties]
-        assert datapoints[0].ignition_type['target'] == 'CH'
-        assert datapoints[0].ignition_type['type'] == 'min'
-
-        # CH*, d/dt max extrapolated
-        assert datapoints[1].ignition_type['target'] == 'CH*'
-        assert datapoints[1].ignition_type['type'] == 'd/dt max extrapolated'
+        assert ([(d.ignition_type['target'], d.ignition_type['type']) for d in datapoints] ==
+                ignition_types)
 
     def test_changing_ignition_type(self):
         properties = self.load_properties('testfile_st.yaml')
@@ -4,10 +4,11 @@ Tests for the converters
 
 # Standard libraries
 import os
-import pkg_resources
+import pathlib
 from requests.exceptions import ConnectionError
 import socket
 from tempfile import TemporaryDirectory
+from concurrent.futures import ThreadPoolExecutor
 import xml.etree.ElementTree as etree
 from shutil import copy
 
@@ -17,16 +18,21 @@ from numpy.testing import assert_allclose
 
 
 # Local imports
+from .. import converters, validation
 from ..converters import (ParseError, KeywordError, MissingElementError,
                           MissingAttributeError
                           )
 from ..converters import (get_file_metadata, get_reference, get_experiment_kind,
                           get_common_properties, get_ignition_type, get_datapoints,
-                          ReSpecTh_to_ChemKED, main, respth2ck, ck2respth
+                          ReSpecTh_to_ChemKED, main, respth2ck, respth2ck_batch, ck2respth
                           )
 from .._version import __version__
+from ..validation import lookup_doi, crossref_api, yaml
 from ..chemked import ChemKED
 
+# Directory holding the test data files
+_test_dir = os.path.dirname(os.path.abspath(__file__))
+
 
 class TestErrors(object):
     """
@@ -111,15 +117,55 @@ class TestFileMetadata(object):
             get_file_metadata(root)
         assert 'Error: required element fileAuthor is missing' in str(excinfo.value)
 
+    def test_external_entity_not_resolved(self, tmpdir):
+        """Ensure external entities in ReSpecTh files cannot disclose local files.
+        """
+        secret = tmpdir.join('secret.txt')
+        secret.write('not for conversion')
+        filename = tmpdir.join('xxe.xml')
+        filename.write(
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<!DOCTYPE experiment [<!ENTITY x SYSTEM "{}">]>\n'
+            '<experiment><fileAuthor>&x;</fileAuthor></experiment>\n'.format(
+                pathlib.Path(str(secret)).as_uri())
+            )
+
+        try:
+            root = converters.etree.parse(str(filename), parser=converters._xml_parser).getroot()
+        except converters.etree.ParseError:
+            # The standard library parser rejects external entities outright
+            return
+        assert b'not for conversion' not in converters.etree.tostring(root)
+
+    def test_internal_entity_resolved(self, tmpdir):
+        """Ensure entities declared in a ReSpecTh file are expanded, with or without lxml.
+        """
+        filename = tmpdir.join('entity.xml')
+        filename.write(
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<!DOCTYPE experiment [<!ENTITY author "Kyle E. Niemeyer">]>\n'
+            '<experiment><fileAuthor>&author;</fileAuthor>'
+            '<dataGroup><dataPoint><x1>&author;</x1></dataPoint></dataGroup></experiment>\n'
+            )
+
+        root = converters.etree.parse(str(filename), parser=converters._xml_parser).getroot()
+        assert root.findtext('fileAuthor') == 'Kyle E. Niemeyer'
+        assert get_file_metadata(root)['file-authors'] == [{'name': 'Kyle E. Niemeyer'}]
+        children = list(root.find('dataGroup/dataPoint'))
+        assert [(child.tag, child.text) for child in children] == [('x1', 'Kyle E. Niemeyer')]
+
 
 class TestGetReference(object):
     """
     """
     @pytest.fixture(scope='function')
-    def disable_socket(self):
+    def disable_socket(self, monkeypatch, tmpdir):
         """Disables socket to prevent network access.
         """
         old_socket = socket.socket
+        # Forget the DOIs looked up by earlier tests, so that they need the network
+        lookup_doi.cache_clear()
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmpdir))
 
         def guard(*args, **kwargs):
             raise ConnectionError("No internet")
@@ -157,6 +203,87 @@ class TestGetReference(object):
         assert {'name': 'F LAFOSSE'} in ref['authors']
         assert {'name': 'C PAILLARD'} in ref['authors']
 
+    def test_reference_lookup_cached(self):
+        """Ensure that the same DOI is only looked up once.
+        """
+        root = etree.Element('experiment')
+        ref = etree.SubElement(root, 'bibliographyLink')
+        ref.set('doi', '10.1016/j.ijhydene.2007.04.008')
+
+        ref_1 = get_reference(root)
+        hits = lookup_doi.cache_info().hits
+        ref_2 = get_reference(root)
+        assert lookup_doi.cache_info().hits == hits + 1
+        assert ref_1 == ref_2
+
+    def test_reference_lookup_cached_on_disk(self, monkeypatch, tmpdir):
+        """Ensure that DOI lookups are reused from the disk cache.
+        """
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmpdir))
+        lookup_doi.cache_clear()
+        ref = lookup_doi('10.1016/j.ijhydene.2007.04.008')
+        assert len(tmpdir.join('pyked', 'crossref').listdir()) == 1
+
+        lookup_doi.cache_clear()
+        monkeypatch.setattr(crossref_api, 'works', None)
+        assert lookup_doi('10.1016/j.ijhydene.2007.04.008') == ref
+
+    @pytest.mark.parametrize('orcid', [
+        'http://orcid.org/0000-0003-4425-7097',
+        'https://orcid.org/0000-0003-4425-7097',
+        '0000-0003-4425-7097',
+        ])
+    def test_reference_author_orcid(self, orcid, monkeypatch):
+        """Ensure ORCIDs from the DOI lookup are stored without their URL prefix.
+        """
+        ref = {'container-title': ['Combustion and Flame'],
+               'published-print': {'date-parts': [[2010]]},
+               'volume': '157',
+               'page': '1-10',
+               'author': [{'given': 'Kyle E.', 'family': 'Niemeyer', 'ORCID': orcid}],
+               }
+        monkeypatch.setattr(converters, 'lookup_doi', lambda doi: ref)
+
+        root = etree.Element('experiment')
+        elem = etree.SubElement(root, 'bibliographyLink')
+        elem.set('doi', '10.1000/placeholder')
+
+        reference = get_reference(root)
+        assert reference['authors'] == [{'name': 'Kyle E. Niemeyer',
+                                         'ORCID': '0000-0003-4425-7097'}]
+
+    def test_reference_no_crossref(self, monkeypatch):
+        """Ensure the DOI is kept and the preferredKey used without a lookup when Crossref is disabled.
+        """
+        monkeypatch.setattr(converters, 'lookup_doi', None)
+        root = etree.Element('experiment')
+        ref = etree.SubElement(root, 'bibliographyLink')
+        ref.set('doi', '10.1016/j.ijhydene.2007.04.008')
+        ref.set('preferredKey', 'Chaumeix, N., Pichon, S., Lafosse, F., Paillard, C.-E., '
+                'International Journal of Hydrogen Energy, 2007, (32) 2216-2226'
+                )
+
+        with pytest.warns(UserWarning) as record:
+            ref = get_reference(root, use_crossref=False)
+        m = str(record.pop(UserWarning).message)
+        assert m == ('Crossref lookup disabled. Setting "detail" key as a fallback; please update '
+                     'to the appropriate fields.')
+
+        assert ref == {'doi': '10.1016/j.ijhydene.2007.04.008',
+                       'detail': 'Chaumeix, N., Pichon, S., Lafosse, F., Paillard, C.-E., '
+                                 'International Journal of Hydrogen Energy, 2007, (32) 2216-2226.'}
+
+    def test_reference_no_crossref_missing_key(self):
+        """Ensure an error is raised if Crossref is disabled and there is no preferredKey.
+        """
+        root = etree.Element('experiment')
+        ref = etree.SubElement(root, 'bibliographyLink')
+        ref.set('doi', '10.1016/j.ijhydene.2007.04.008')
+
+        with pytest.raises(KeywordError) as excinfo:
+            get_reference(root, use_crossref=False)
+        assert 'Crossref lookup disabled and preferredKey attribute not set' in str(excinfo.value)
+
     def test_missing_bibliography(self):
         """Test for completely missing bibliography element.
         """
@@ -403,6 +530,15 @@ class TestGetExperiment(object):
             get_experiment_kind(root)
         assert apparatus + ' experiment not (yet) supported' in str(excinfo.value)
 
+    def test_missing_experiment_type(self):
+        """Ensure proper error raised if missing experiment type.
+        """
+        root = etree.Element('experiment')
+
+        with pytest.raises(MissingElementError) as excinfo:
+            get_experiment_kind(root)
+        assert 'Error: required element experimentType is missing.' in str(excinfo.value)
+
     def test_missing_apparatus_kind(self):
         """Ensure proper error raised if missing apparatus kind.
         """
@@ -1194,6 +1330,41 @@ class TestGetDatapoints(object):
                                                           'InChI': None
                                                           }
 
+    def test_datapoints_composition_warning_once(self):
+        """Test that the composition units warning is only given once for many datapoints.
+        """
+        root = etree.Element('experiment')
+        datagroup = etree.SubElement(root, 'dataGroup')
+        prop = etree.SubElement(datagroup, 'property')
+        prop.set('id', 'x1')
+        prop.set('name', 'temperature')
+        prop.set('units', 'K')
+        prop = etree.SubElement(datagroup, 'property')
+        prop.set('id', 'x2')
+        prop.set('name', 'composition')
+        prop.set('units', 'ppm')
+        specieslink = etree.SubElement(prop, 'speciesLink')
+        specieslink.set('preferredKey', 'H2')
+        specieslink.set('InChI', '1S/H2/h1H')
+
+        for temperature in [1000.0, 1100.0, 1200.0]:
+            datapoint = etree.SubElement(datagroup, 'dataPoint')
+            x1 = etree.SubElement(datapoint, 'x1')
+            x1.text = str(temperature)
+            x2 = etree.SubElement(datapoint, 'x2')
+            x2.text = str(1.0)
+
+        with pytest.warns(UserWarning) as record:
+            datapoints = get_datapoints(root)
+        assert len(record) == 1
+        m = str(record.pop(UserWarning).message)
+        assert m == 'Assuming molar ppm in composition and converting to mole fraction'
+
+        assert len(datapoints) == 3
+        for datapoint in datapoints:
+            assert datapoint['composition']['kind'] == 'mole fraction'
+            assert datapoint['composition']['species'][0]['amount'] == [1.0e-6]
+
     def test_datapoints_composition_error(self):
         """Test valid parsing of datapoints with improper unit error.
         """
@@ -1283,7 +1454,7 @@ class TestConvertReSpecTh(object):
         """Test proper conversion of ReSpecTh files.
         """
         file_path = os.path.join(filename_xml)
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
         file_author = 'Kyle Niemeyer'
         file_author_orcid = '0000-0003-4425-7097'
         # Skip all the validation because we know the test files are correct and we're not
@@ -1293,7 +1464,7 @@ class TestConvertReSpecTh(object):
 
         # compare with ChemKED file of same experiment
         file_path = os.path.join(os.path.splitext(filename_xml)[0] + '.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
         c_true = ChemKED(yaml_file=filename, skip_validation=True)
 
         assert c.file_authors[1]['name'] == file_author
@@ -1311,7 +1482,7 @@ class TestConvertReSpecTh(object):
         """Test for appropriate error if RCM file has pressure rise.
         """
         file_path = os.path.join('testfile_rcm.xml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
 
         # add pressure rise to common properties
         tree = etree.parse(filename)
@@ -1338,7 +1509,7 @@ class TestConvertReSpecTh(object):
         """Test for appropriate error if shock tube file has volume history.
         """
         file_path = os.path.join('testfile_st.xml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
 
         tree = etree.parse(filename)
         root = tree.getroot()
@@ -1372,7 +1543,7 @@ class TestConvertReSpecTh(object):
         """Test that passing an ORCID to the conversion without a name raises an error
         """
         file_path = os.path.join('testfile_st.xml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
         file_author_orcid = '0000-0003-4425-7097'
         # Skip all the validation because we know the test files are correct and we're not
         # testing the validation methods here
@@ -1385,7 +1556,7 @@ class TestConvertReSpecTh(object):
         """Test that passing the file author only works properly
         """
         file_path = os.path.join('testfile_st.xml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
         file_author = 'Kyle Niemeyer'
         # Skip all the validation because we know the test files are correct and we're not
         # testing the validation methods here
@@ -1403,7 +1574,7 @@ class TestConverterMain(object):
         """Test detection in converter for xml->yaml
         """
         file_path = os.path.join('testfile_st.xml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
         file_author = 'Kyle E Niemeyer'
         file_author_orcid = '0000-0003-4425-7097'
 
@@ -1415,7 +1586,7 @@ class TestConverterMain(object):
 
         m = str(record.pop(UserWarning).message)
         assert m == 'Using DOI to obtain reference information, rather than preferredKey.'
-        true_yaml = pkg_resources.resource_filename(__name__, os.path.join('testfile_st.yaml'))
+        true_yaml = os.path.join(_test_dir, os.path.join('testfile_st.yaml'))
         c_true = ChemKED(yaml_file=true_yaml)
 
         assert c.file_authors[0]['name'] == c_true.file_authors[0]['name']
@@ -1433,7 +1604,7 @@ class TestConverterMain(object):
         """Test detection in converter for yaml->xml
         """
         file_path = os.path.join('testfile_st.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
         fa_name = 'Kyle Niemeyer'
         fa_orcid = '0000-0003-4425-7097'
 
@@ -1447,7 +1618,7 @@ class TestConverterMain(object):
         """Test respth2ck converter when used via command-line arguments.
         """
         file_path = os.path.join('testfile_st.xml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
 
         with TemporaryDirectory() as temp_dir:
             xml_file = copy(filename, temp_dir)
@@ -1464,7 +1635,7 @@ class TestConverterMain(object):
         """Test respth2ck converter when used via command-line arguments.
         """
         file_path = os.path.join('testfile_st.xml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
 
         with TemporaryDirectory() as temp_dir:
             newfile = os.path.join(temp_dir, 'test.yaml')
@@ -1476,11 +1647,104 @@ class TestConverterMain(object):
         m = str(record.pop(UserWarning).message)
         assert m == 'Using DOI to obtain reference information, rather than preferredKey.'
 
+    def test_conversion_respth2ck_no_crossref(self, monkeypatch):
+        """Test respth2ck converter without Crossref lookups or validation.
+        """
+        # Any DOI lookup, during conversion or validation, would fail
+        monkeypatch.setattr(converters, 'lookup_doi', None)
+        monkeypatch.setattr(validation, 'lookup_doi', None)
+        filename = os.path.join(_test_dir, 'testfile_st.xml')
+
+        with TemporaryDirectory() as temp_dir:
+            newfile = os.path.join(temp_dir, 'test.yaml')
+            with pytest.warns(UserWarning) as record:
+                respth2ck(['-i', filename, '-o', newfile, '--no-crossref'])
+
+            with open(newfile, 'r') as f:
+                reference = yaml.safe_load(f)['reference']
+
+        m = str(record.pop(UserWarning).message)
+        assert m == ('Crossref lookup disabled. Setting "detail" key as a fallback; please update '
+                     'to the appropriate fields.')
+        assert reference['doi'] == '10.1016/j.ijhydene.2007.04.008'
+        assert reference['detail'].startswith('Chaumeix, N., Pichon, S., Lafosse, F.')
+        assert 'authors' not in reference
+
+    def test_conversion_respth2ck_batch(self):
+        """Test respth2ck_batch converter when used via command-line arguments.
+        """
+        filenames = [os.path.join(_test_dir, f)
+                     for f in ['testfile_st.xml', 'testfile_rcm.xml']]
+
+        with TemporaryDirectory() as temp_dir:
+            respth2ck_batch(['-i'] + filenames + ['-d', temp_dir, '-j', '2'])
+
+            assert os.path.exists(os.path.join(temp_dir, 'testfile_st.yaml'))
+            assert os.path.exists(os.path.join(temp_dir, 'testfile_rcm.yaml'))
+
+    def test_conversion_respth2ck_batch_input_dir(self):
+        """Test respth2ck_batch converter on a directory of ReSpecTh files.
+        """
+        filename = os.path.join(_test_dir, 'testfile_st.xml')
+
+        with TemporaryDirectory() as temp_dir:
+            copy(filename, temp_dir)
+            respth2ck_batch(['-id', temp_dir, '-j', '1'])
+
+            assert os.path.exists(os.path.join(temp_dir, 'testfile_st.yaml'))
+
+    def test_conversion_respth2ck_batch_new_output_dir(self):
+        """Test respth2ck_batch converter creates the output directory.
+        """
+        filename = os.path.join(_test_dir, 'testfile_st.xml')
+
+        with TemporaryDirectory() as temp_dir:
+            output_dir = os.path.join(temp_dir, 'converted', 'yaml')
+            respth2ck_batch(['-i', filename, '-d', output_dir, '-j', '1'])
+
+            assert os.path.exists(os.path.join(output_dir, 'testfile_st.yaml'))
+
+    def test_conversion_respth2ck_batch_same_output(self):
+        """Test respth2ck_batch converter exits when two inputs have the same output file.
+        """
+        filename = os.path.join(_test_dir, 'testfile_st.xml')
+
+        with TemporaryDirectory() as temp_dir:
+            os.mkdir(os.path.join(temp_dir, 'other'))
+            copy(filename, os.path.join(temp_dir, 'other'))
+            with pytest.raises(SystemExit):
+                respth2ck_batch(['-i', filename, os.path.join(temp_dir, 'other', 'testfile_st.xml'),
+                                 '-d', temp_dir])
+
+            assert not os.path.exists(os.path.join(temp_dir, 'testfile_st.yaml'))
+
+    def test_conversion_respth2ck_batch_duplicate_input(self, monkeypatch):
+        """Test respth2ck_batch converter converts a file given twice only once.
+        """
+        converted = []
+        monkeypatch.setattr(converters, 'ProcessPoolExecutor', ThreadPoolExecutor)
+        monkeypatch.setattr(converters, 'respth2ck', converted.append)
+        filename = os.path.join(_test_dir, 'testfile_st.xml')
+
+        with TemporaryDirectory() as temp_dir:
+            xml_file = copy(filename, temp_dir)
+            respth2ck_batch(['-i', xml_file, '-id', temp_dir, '-d', temp_dir])
+
+        assert len(converted) == 1
+        assert converted[0][:2] == ['-i', xml_file]
+
+    def test_conversion_respth2ck_batch_no_input(self):
+        """Test respth2ck_batch converter exits when no input files are given.
+        """
+        with TemporaryDirectory() as temp_dir:
+            with pytest.raises(SystemExit):
+                respth2ck_batch(['-id', temp_dir])
+
     def test_conversion_ck2respth(self):
         """Test ck2respth converter when used via command-line arguments.
         """
         file_path = os.path.join('testfile_st.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
 
         with TemporaryDirectory() as temp_dir:
             newfile = os.path.join(temp_dir, 'test.xml')
@@ -1492,7 +1756,7 @@ class TestConverterMain(object):
         """Test converter main raises errors when two xml files are passed.
         """
         file_path = os.path.join('testfile_st.xml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
 
         with pytest.raises(KeywordError) as excinfo:
             main(['-i', filename, '-o', 'test.xml'])
@@ -1502,7 +1766,7 @@ class TestConverterMain(object):
         """Test converter main raises errors when two yaml files are passed.
         """
         file_path = os.path.join('testfile_st.yaml')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
 
         with pytest.raises(KeywordError) as excinfo:
             main(['-i', filename, '-o', 'test.yaml'])
@@ -1512,7 +1776,7 @@ class TestConverterMain(object):
         """Test converter main raises errors when an invalid file extension is passed.
         """
         file_path = os.path.join('dataframe_st.csv')
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
 
         with pytest.raises(KeywordError) as excinfo:
             main(['-i', filename, '-o', 'test.py'])
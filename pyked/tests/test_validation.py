@@ -4,15 +4,22 @@ Tests for the utils
 
 # Standard libraries
 import os
-import pkg_resources
 from requests.exceptions import ConnectionError
 import socket
+import json
+import time
+import hashlib
 
 import pytest
-import yaml
 
-from ..validation import schema, OurValidator, compare_name, property_units
+from ..validation import (schema, OurValidator, compare_name, property_units, lookup_doi,
+                          yaml, crossref_api, DOI_CACHE_MAX_AGE)
 from .._version import __version__
+from .._yaml_compat import SafeLoader, SafeDumper
+from ..orcid import session as orcid_session, _fetch_person
+
+# Directory holding the test data files
+_test_dir = os.path.dirname(os.path.abspath(__file__))
 
 
 def no_internet(host='8.8.8.8', port=53, timeout=1):
@@ -30,7 +37,8 @@ def no_internet(host='8.8.8.8', port=53, timeout=1):
 
 internet_missing = pytest.mark.skipif(no_internet(), reason='Internet not available')
 
-schema['chemked-version']['allowed'].append(__version__)
+if __version__ not in schema['chemked-version']['allowed']:
+    schema['chemked-version']['allowed'].append(__version__)
 
 v = OurValidator(schema)
 
@@ -81,15 +89,70 @@ class TestCompareName(object):
         assert compare_name(given, family, question_name)
 
 
+class TestYAMLLoader(object):
+    """
+    """
+    def test_libyaml_preferred(self):
+        """Ensure the libyaml-backed loader and dumper are used when PyYAML was built with libyaml.
+        """
+        if not yaml.__with_libyaml__:
+            pytest.skip('PyYAML was built without libyaml')
+        assert SafeLoader is yaml.CSafeLoader
+        assert SafeDumper is yaml.CSafeDumper
+
+
+class TestLookupDOI(object):
+    """
+    """
+    @pytest.fixture(scope='function')
+    def cache_file(self, monkeypatch, tmpdir):
+        """Write a cached lookup of a DOI and count the lookups made to Crossref.
+        """
+        lookup_doi.cache_clear()
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmpdir))
+        lookups = []
+
+        def works(ids):
+            lookups.append(ids)
+            return {'message': {'title': ['Fetched']}}
+
+        monkeypatch.setattr(crossref_api, 'works', works)
+        cache_file = tmpdir.join('pyked', 'crossref',
+                                 hashlib.sha1(b'10.1000/test').hexdigest() + '.json')
+        yield cache_file, lookups
+        lookup_doi.cache_clear()
+
+    def test_fresh_cache_file(self, cache_file):
+        cache_file, lookups = cache_file
+        cache_file.write(json.dumps({'title': ['Cached']}), ensure=True)
+        assert lookup_doi('10.1000/test') == {'title': ['Cached']}
+        assert lookups == []
+
+    def test_stale_cache_file(self, cache_file):
+        cache_file, lookups = cache_file
+        cache_file.write(json.dumps({'title': ['Cached']}), ensure=True)
+        old = time.time() - DOI_CACHE_MAX_AGE - 1
+        os.utime(str(cache_file), (old, old))
+        assert lookup_doi('10.1000/test') == {'title': ['Fetched']}
+        assert lookups == ['10.1000/test']
+        assert json.loads(cache_file.read()) == {'title': ['Fetched']}
+
+
 class TestValidator(object):
     """
     """
     @pytest.fixture(scope='function')
-    def disable_socket(self):
+    def disable_socket(self, monkeypatch, tmpdir):
         """Disables socket to prevent network access.
         """
         import socket
         old_socket = socket.socket
+        # Forget the DOIs looked up by earlier tests, so that they need the network
+        lookup_doi.cache_clear()
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmpdir))
+        # Drop pooled connections, which would not need a new socket
+        orcid_session.close()
+        _fetch_person.cache_clear()
 
         def guard(*args, **kwargs):
             raise ConnectionError("No internet")
@@ -356,14 +419,15 @@ class TestValidator(object):
     @pytest.fixture(scope='function')
     def properties(self, request):
         file_path = os.path.join(request.param)
-        filename = pkg_resources.resource_filename(__name__, file_path)
+        filename = os.path.join(_test_dir, file_path)
 
         with open(filename, 'r') as f:
-            return yaml.load(f)
+            return yaml.load(f, Loader=SafeLoader)
 
     @pytest.mark.parametrize("properties", [
         'testfile_st.yaml', 'testfile_st2.yaml', 'testfile_rcm.yaml', 'testfile_required.yaml',
-        'testfile_uncertainty.yaml', 'testfile_rcm2.yaml',
+        'testfile_uncertainty.yaml', 'testfile_rcm2.yaml', 'testfile_rcm_old.yaml',
+        'testfile_st_p5.yaml',
     ], indirect=['properties'])
     def test_valid_yaml(self, properties):
         """Ensure ChemKED YAML is validated
@@ -1,14 +1,19 @@
 """Validation class for ChemKED schema.
 """
+import os
 from warnings import warn
+from functools import lru_cache
+import hashlib
+import json
 import re
+import time
 
 from pkg_resources import resource_filename
 import yaml
 
 import numpy as np
 import pint
-from requests.exceptions import HTTPError, ConnectionError
+from requests.exceptions import HTTPError, ConnectionError, Timeout
 from cerberus import Validator, SchemaError
 import habanero
 from .orcid import search_orcid
@@ -19,8 +24,71 @@ units = pint.UnitRegistry()
 units.define('cm3 = centimeter**3')
 Q_ = units.Quantity
 
+# Only pass arguments that every supported version of habanero accepts
 crossref_api = habanero.Crossref(mailto='prometheus@pr.omethe.us')
 
+
+def _get_cache_dir():
+    """Get the directory of the on-disk caches, ``$XDG_CACHE_HOME/pyked`` or ``~/.cache/pyked``.
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'pyked')
+
+
+# Seconds before a DOI looked up on disk is fetched from Crossref again, so that corrections to the
+# metadata are eventually picked up
+DOI_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+
+def _write_cache_file(filename, data):
+    """Write data to a JSON cache file. Failing to write the cache is not an error.
+    """
+    # Write to a temporary file first so concurrent readers never see a partial file
+    temp_filename = '{}.{}'.format(filename, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(temp_filename, 'w') as f:
+            json.dump(data, f)
+        os.replace(temp_filename, filename)
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=None)
+def _get_dimensionality(unit_expression):
+    """Get the dimensionality of a unit expression, caching the result.
+    """
+    return units(unit_expression).dimensionality
+
+
+@lru_cache(maxsize=1024)
+def lookup_doi(doi):
+    """Look up the metadata of a DOI with the Crossref API.
+
+    Successful lookups are cached in memory and on disk under ``crossref`` in the cache directory,
+    since the same DOI is usually looked up both when a file is converted and when it is
+    validated. Entries on disk older than `DOI_CACHE_MAX_AGE` seconds are looked up again.
+
+    Args:
+        doi (`str`): The DOI to look up
+
+    Returns:
+        `dict`: The metadata of the work registered to the DOI. Must not be modified.
+    """
+    cache_file = os.path.join(_get_cache_dir(), 'crossref',
+                              hashlib.sha1(doi.encode('utf-8')).hexdigest() + '.json')
+    try:
+        if time.time() - os.path.getmtime(cache_file) < DOI_CACHE_MAX_AGE:
+            with open(cache_file, 'r') as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    ref = crossref_api.works(ids=doi)['message']
+    _write_cache_file(cache_file, ref)
+    return ref
+
+
 # Load the ChemKED schema definition file
 schema_file = resource_filename(__name__, 'schemas/chemked_schema.yaml')
 with open(schema_file, 'r') as f:
@@ -210,10 +278,7 @@ class OurValidator(Validator):
             {'isvalid_unit': {'type': 'bool'}, 'field': {'type': 'str'},
              'value': {'type': 'dict'}}
         """
-        quantity = 1.0 * units(value['units'])
-        try:
-            quantity.to(property_units[field])
-        except pint.DimensionalityError:
+        if _get_dimensionality(value['units']) != _get_dimensionality(property_units[field]):
             self._error(field, 'incompatible units; should be consistent '
                         'with ' + property_units[field]
                         )
@@ -236,18 +301,14 @@ class OurValidator(Validator):
             history_type = 'emission'
         elif history_type.endswith('absorption'):
             history_type = 'absorption'
-        quantity = 1.0*(units(value['quantity']['units']))
-        try:
-            quantity.to(property_units[history_type])
-        except pint.DimensionalityError:
+        if (_get_dimensionality(value['quantity']['units']) !=
+                _get_dimensionality(property_units[history_type])):
             self._error(field, 'incompatible units; should be consistent '
                         'with ' + property_units[history_type])
 
         # Check that time has appropriate units
-        time = 1.0*(units(value['time']['units']))
-        try:
-            time.to(property_units['time'])
-        except pint.DimensionalityError:
+        if (_get_dimensionality(value['time']['units']) !=
+                _get_dimensionality(property_units['time'])):
             self._error(field, 'incompatible units; should be consistent '
                         'with ' + property_units['time'])
 
@@ -329,11 +390,11 @@ class OurValidator(Validator):
         """
         if 'doi' in value:
             try:
-                ref = crossref_api.works(ids=value['doi'])['message']
+                ref = lookup_doi(value['doi'])
             except (HTTPError, habanero.RequestError):
                 self._error(field, 'DOI not found')
                 return
-            except ConnectionError:
+            except (ConnectionError, Timeout):
                 warn('network not available, DOI not validated.')
                 return
 
@@ -433,7 +494,7 @@ class OurValidator(Validator):
         if isvalid_orcid and 'ORCID' in value:
             try:
                 res = search_orcid(value['ORCID'])
-            except ConnectionError:
+            except (ConnectionError, Timeout):
                 warn('network not available, ORCID not validated.')
                 return
             except HTTPError:
@@ -31,10 +31,12 @@ install_requires = [
 tests_require = [
     'pytest>=3.2.0',
     'pytest-cov',
+    'pytest-xdist',
 ]
 
 extras_require = {
     'dataframes': ['pandas >=0.22.0,<0.23'],
+    'lxml': ['lxml>=5.0'],
 }
 
 needs_pytest = {'pytest', 'test', 'ptr'}.intersection(sys.argv)
@@ -74,6 +76,7 @@ setup(
     entry_points={
         'console_scripts': ['convert_ck=pyked.converters:main',
                             'respth2ck=pyked.converters:respth2ck',
+                            'respth2ck_batch=pyked.converters:respth2ck_batch',
                             'ck2respth=pyked.converters:ck2respth',
                             ],
     }